@@ -1,13 +1,143 @@
 import streamlit as st
-from streamlit_folium import folium_static
-import folium
-import pandas as pd
-from geopy.geocoders import Nominatim
-import math
+import streamlit.components.v1 as components
 
 import os
-import json
-import requests
+from concurrent import futures
+from datetime import datetime, timedelta, timezone
+
+from centres import get_registry
+from connection import connection_info
+from distances import distance
+from geocoding import AddressNotFound, convert_address
+from lite import is_slow_connection, lite_results
+from live_map import live_map, live_map_state
+from maps import MAP_HEIGHT, MAP_WIDTH, map_cache
+from nearest_grid import get_nearest_grid
+from onemap import onemap_client
+from routing import available_profiles, get_road_graph
+from static_map import get_static_map_renderer
+from tasks import TaskSlots
+from transit import get_transit_network
+from upstream import UpstreamError
+
+
+NEAREST_CENTRES = 5
+# the standard map is a new folium document per rerun, the live map is updated in place and
+# the map image is a small picture drawn on the server (offered once the map tiles are seeded)
+MAP_DISPLAYS = ["Standard map", "Live map"]
+MAP_IMAGE = "Map image"
+SINGAPORE_TIME = timezone(timedelta(hours=8))
+# how long a page waits for a road route before drawing the straight line first, enough for
+# routes from the route cache and short ones
+ROUTE_WAIT = 0.2  # seconds
+
+
+# search term and result index of the right OneMap result for centres whose name alone
+# does not find them first; only used for centres missing from the compiled dataset
+ONEMAP_RESULT_HINTS = {
+	"Raffles City Convention Centre": ("Raffles City", 4),  # Raffles City Shopping Centre
+	"Tanjong Pagar Community Club": (None, 1),
+	"Jalan Besar Community Club": (None, 1),
+	"Bishan Community Club": (None, 4),
+	"Queenstown Community Centre": (None, 3),
+	"Toa Payoh West Community Club": (None, 1),
+	"Bukit Timah Community Club": (None, 1),
+	"Canberra Community Club": (None, 2),
+	"Nee Soon East Community Club": (None, 1),
+	"Changi Airport Terminal 4": (None, 6),
+	"Bedok Community Centre": (None, 1),
+	"Arena@ Our Tampines Hub (Hockey Court)": ("Our Tampines Hub", 1),
+	"Former Hong Kah Secondary School": ("Hong Kah Secondary School", 0),
+	"Nanyang Community Club": (None, 1),
+	"Clementi Community Centre": (None, 1),
+	"Chua Chu Kang Community Club": (None, 2),
+	"Kolam Ayer Community Club": (None, 1),
+	"Marsiling Community Club": (None, 4),
+	"Woodlands Community Club": (None, 1),
+	"Tampines East Community Club": (None, 2),
+	"Kebun Baru Community Club": (None, 3),
+	"Hong Kah North Community Club": (None, 4),
+}
+
+
+def centre_search(vc):
+	search_val, index = ONEMAP_RESULT_HINTS.get(vc, (None, 0))
+	return search_val or vc, index
+
+
+def centre_location(vc):
+	# centres from the compiled dataset are answered locally without a OneMap round-trip
+	results = get_registry().location(vc)
+	if results is not None:
+		return results
+	search_val, index = centre_search(vc)
+	return onemap_client.search(search_val)['results'][index]
+
+
+def prefetch_centres(names):
+	# look up every other centre in the list in the background while the page renders, so
+	# choosing another one is answered from the OneMap cache
+	registry = get_registry()
+	onemap_client.prefetch([centre_search(name)[0] for name in names if not registry.has_location(name)])
+
+
+def session_tasks():
+	tasks = st.session_state.get("tasks")
+	if tasks is None:
+		tasks = st.session_state["tasks"] = TaskSlots()
+	return tasks
+
+
+def resolve_address(address_text):
+	# geocode the typed address in the background; the future is kept across reruns, so the
+	# point is looked up once per session until the text changes, which cancels the old lookup
+	return session_tasks().submit("origin", address_text, convert_address, address_text)
+
+
+def locate_centre(vc):
+	return session_tasks().submit("centre", vc, centre_location, vc)
+
+
+def road_route(profile, origin, centre_point):
+	return get_road_graph(profile).route(origin, centre_point)
+
+
+def find_route(profile, origin, centre_point):
+	# A* can take up to a second across the island, see routing.py
+	return session_tasks().submit("route", (profile, tuple(origin), tuple(centre_point)), road_route, profile, origin,
+								  centre_point)
+
+
+def lite_mode():
+	# ?lite=1 or ?lite=0 in the URL decides, otherwise the browser's connection does;
+	# None until the browser has answered
+	value = st.experimental_get_query_params().get("lite", [None])[0]
+	if value is not None:
+		return value not in ("0", "false", "no")
+	info = connection_info()
+	if info is None:
+		return None
+	return is_slow_connection(info)
+
+
+def lite_centres_page(registry):
+	# text only: no map, no per-centre widgets, see lite.py
+	st.header("Find a vaccination centre near you")
+	address_text = st.text_input('Type your Address (For example, 108 Punggol Field):', '')
+	if address_text:
+		vaccine_brands = st.multiselect("Choose your desired vaccine type", registry.vaccine_types,
+										default=registry.vaccine_types[:1])
+		regions = st.multiselect("Select a region in Singapore you live in or you plan to go to",
+								 registry.regions, default=registry.regions[:1])
+		try:
+			origin = resolve_address(address_text).result()
+			st.subheader("Nearest vaccination centres to you")
+			st.markdown(lite_results(registry, origin, address_text, vaccine_brands, regions))
+		except AddressNotFound:
+			st.header("Please type a valid address")
+		except UpstreamError:
+			st.header("The address lookup service is not responding right now, please try again in a moment")
+	st.markdown("[Switch to the full version with maps](?lite=0)")
 
 
 def main():
@@ -17,11 +147,15 @@ def main():
 	st.sidebar.subheader('Select display page')
 
 	select_menu = st.sidebar.selectbox("Menu", menu)
+	lite = lite_mode()
 
 	if select_menu == "About This App":
 		st.markdown("")
 		st.markdown("")
-		st.image('PM-Lee-covid-vaccine-cover-1.jpg')
+		# the cover image is most of the page's weight: left out in lite mode, and held back
+		# until the browser has said whether its connection is slow
+		if lite is False:
+			st.image('PM-Lee-covid-vaccine-cover-1.jpg')
 		st.header("Background")
 		'''
 		On 14 December 2020, Prime Minister Lee Hsien Loong announced that Covid-19 vaccinations will be free for all Singaporeans and long-term residents (Koh, 2020).
@@ -40,6 +174,7 @@ def main():
 		st.header("Limitation")
 		'''
 		The distance between the user's residence and the chosen vaccination centre did not take into account the roads on the map but it is merely based on one point to one point, hence, the straight line.
+		Where the offline road network has been built, the walking or driving distance along the roads can be chosen instead and the route is drawn on the map.
 		'''
 		st.header("Future Work")
 		'''
@@ -57,38 +192,17 @@ def main():
 		
 		Ministry of Health. (2021). *Vaccination Centres.* April. Retrieved from [https://www.vaccine.gov.sg/locations-vcs](https://www.vaccine.gov.sg/locations-vcs)
 		'''
+	elif select_menu == "Vaccination Centres" and lite:
+		st.markdown("")
+		lite_centres_page(get_registry())
 	elif select_menu == "Vaccination Centres":
 
-		def convert_address(address):
-			# using Nominatin from Geopy to convert address to latitude and longitude coordinates
-			geolocator = Nominatim(user_agent="my_app")  # using open street map API
-			Geo_Coordinate = geolocator.geocode(address)
-			lat = Geo_Coordinate.latitude
-			lon = Geo_Coordinate.longitude
-			# Convert the lat long into a list and store is as points
-			point = [lat, lon]
-			return point
-
-		def distance(origin, lat2, lon2):
-			lat1 = float(origin[0])
-			lon1 = float(origin[1])
-			lat2 = float(lat2)
-			lon2 = float(lon2)
-			radius = 6371  # km
-
-			dlat = math.radians(lat2 - lat1)
-			dlon = math.radians(lon2 - lon1)
-			a = math.sin(dlat / 2) * math.sin(dlat / 2) + math.cos(math.radians(lat1)) \
-				* math.cos(math.radians(lat2)) * math.sin(dlon / 2) * math.sin(dlon / 2)
-			c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-			d = radius * c
-			d = round(d,2)
-			return d
-
 		st.markdown("")
 		st.header("Find a vaccination centre near you")
 
-		df = pd.read_csv('Vaccination_Centres.csv')
+		registry = get_registry()
+		static_map_renderer = get_static_map_renderer()
+		map_display = st.sidebar.radio("Map display", MAP_DISPLAYS + ([MAP_IMAGE] if static_map_renderer else []))
 
 		address_text = st.text_input('Type your Address (For example, 108 Punggol Field):', '')
 
@@ -96,1018 +210,164 @@ def main():
 
 			try:
 
-				vaccine_brand = st.selectbox("Choose your desired vaccine type",
-											 df.loc[:, "Vaccine Type"].unique())  # ["Pfizer", "Moderna"])
-				region = st.selectbox("Select a region in Singapore you live in or you plan to go to",
-									  df.loc[:, "Region"].unique())  # ["Central", "North", "East", "North East", "West"])
+				vaccine_brands = st.multiselect("Choose your desired vaccine type", registry.vaccine_types,
+												default=registry.vaccine_types[:1])
+				regions = st.multiselect("Select a region in Singapore you live in or you plan to go to",
+										 registry.regions, default=registry.regions[:1])
 
 				address_text_plus = address_text.replace(" ", "+")
-
-				if vaccine_brand == "Pfizer" and region == "Central":
-					central_pfizer_df = df[(df["Vaccine Type"] == "Pfizer") & (df["Region"] == "Central")]
-					vc = st.radio("Choose the vaccination centre", central_pfizer_df.loc[:, "Name"].unique())
-
-					if vc == "Raffles City Convention Centre":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str("Raffles City") + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][4] # Raffles City Shopping Centre from OneMapAPI in this 4th index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup="RAFFLES CITY CONVENTION CENTRE").add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address", icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown("Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Tanjong Pagar Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Tanjong Pagar CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Jalan Besar Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Jalan Besar CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Bishan Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][4] # Bishan CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Queenstown Community Centre":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][3] # Queenstown CC from OneMapAPI in this 3rd index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Toa Payoh West Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # TPY West CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Bukit Timah Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Bukit Timah CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					else:
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						location_names = []
-						location_coordinates = []
-						length = data['found']
-
-						maximum = 1
-						if length == 1:
-							maximum = length
-						if length > 0:
-							for i in range(maximum):
-								results = data['results'][i]
-								location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-								location_names.append(results['SEARCHVAL'])
-
-							st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-								'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-								distance(convert_address(address_text), results['LATITUDE'],
-										 results['LONGITUDE'])) + "km**.")
-
-							m = folium.Map(location=location_coordinates[0], zoom_start=12)
-							# add markers
-							for point in range(0, maximum):
-								folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-								folium.Marker(convert_address(address_text), popup="Your Address",
-											  icon=folium.Icon(icon="home")).add_to(m)
-								folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-							# call to render Folium map in Streamlit
-							folium_static(m)
-
-							vc2 = vc.replace(" ", "+")
-							dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-							st.markdown(
-								"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-							st.markdown(dir_link, unsafe_allow_html=True)
-
-				elif vaccine_brand == "Pfizer" and region == "North":
-					north_pfizer_df = df[(df["Vaccine Type"] == "Pfizer") & (df["Region"] == "North")]
-					vc = st.radio("Choose the vaccination centre", north_pfizer_df.loc[:, "Name"].unique())
-
-					if vc == "Canberra Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][2] # Canberra CC from OneMapAPI in this 2nd index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Nee Soon East Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Nee Soon East CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
+				origin_task = resolve_address(address_text)
+				centre_names = registry.query(vaccine_brands, regions)
+				# look up the centre chosen on the previous run while the address is being geocoded
+				if centre_names:
+					selected = st.session_state.get("centre")
+					locate_centre(selected if selected in centre_names else centre_names[0])
+
+				# the page is laid out first and filled in as results arrive: the centre's address as
+				# soon as it is known, then everything measured from the typed address once it has
+				# been geocoded, and the map last
+				nearest_section = st.beta_container()
+
+				if centre_names:
+					if len(vaccine_brands) == 1:
+						vc = st.radio("Choose the vaccination centre", centre_names, key="centre")
 					else:
-
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						location_names = []
-						location_coordinates = []
-						length = data['found']
-
-						maximum = 1
-						if length == 1:
-							maximum = length
-						if length > 0:
-							for i in range(maximum):
-								results = data['results'][i]
-								location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-								location_names.append(results['SEARCHVAL'])
-
-							st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-								'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-								distance(convert_address(address_text), results['LATITUDE'],
-										 results['LONGITUDE'])) + "km**.")
-
-							m = folium.Map(location=location_coordinates[0], zoom_start=12)
-							# add markers
-							for point in range(0, maximum):
-								folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-								folium.Marker(convert_address(address_text), popup="Your Address",
-											  icon=folium.Icon(icon="home")).add_to(m)
-								folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-							# call to render Folium map in Streamlit
-							folium_static(m)
-
-							vc2 = vc.replace(" ", "+")
-							dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-							st.markdown(
-								"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-							st.markdown(dir_link, unsafe_allow_html=True)
-
-				elif vaccine_brand == "Pfizer" and region == "East":
-					east_pfizer_df = df[(df["Vaccine Type"] == "Pfizer") & (df["Region"] == "East")]
-					vc = st.radio("Choose the vaccination centre", east_pfizer_df.loc[:, "Name"].unique())
-
-					if vc == "Changi Airport Terminal 4":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][6] # T4 from OneMapAPI in this 6th index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Bedok Community Centre":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Bedok CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Arena@ Our Tampines Hub (Hockey Court)":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str("Our Tampines Hub") + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Our Tampines Hub from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup="ARENA@ OUR TAMPINES HUB").add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					else:
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						location_names = []
-						location_coordinates = []
-						length = data['found']
-
-						maximum = 1
-						if length == 1:
-							maximum = length
-						if length > 0:
-							for i in range(maximum):
-								results = data['results'][i]
-								location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-								location_names.append(results['SEARCHVAL'])
-
-							st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-								'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-								distance(convert_address(address_text), results['LATITUDE'],
-										 results['LONGITUDE'])) + "km**.")
-
-							m = folium.Map(location=location_coordinates[0], zoom_start=12)
-							# add markers
-							for point in range(0, maximum):
-								folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-								folium.Marker(convert_address(address_text), popup="Your Address",
-											  icon=folium.Icon(icon="home")).add_to(m)
-								folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-							# call to render Folium map in Streamlit
-							folium_static(m)
-
-							vc2 = vc.replace(" ", "+")
-							dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-							st.markdown(
-								"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-							st.markdown(dir_link, unsafe_allow_html=True)
-
-				elif vaccine_brand == "Pfizer" and region == "North East":
-					northeast_pfizer_df = df[(df["Vaccine Type"] == "Pfizer") & (df["Region"] == "North East")]
-					vc = st.radio("Choose the vaccination centre", northeast_pfizer_df.loc[:, "Name"].unique())
-
-					query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-					resp = requests.get(query_string)
-					data = json.loads(resp.content)
-
-					location_names = []
-					location_coordinates = []
-					length = data['found']
-
-					maximum = 1
-					if length == 1:
-						maximum = length
-					if length > 0:
-						for i in range(maximum):
-							results = data['results'][i]
-							location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-							location_names.append(results['SEARCHVAL'])
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=location_coordinates[0], zoom_start=12)
-						# add markers
-						for point in range(0, maximum):
-							folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-							folium.Marker(convert_address(address_text), popup="Your Address",
-										  icon=folium.Icon(icon="home")).add_to(m)
-							folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-				elif vaccine_brand == "Pfizer" and region == "West":
-					west_pfizer_df = df[(df["Vaccine Type"] == "Pfizer") & (df["Region"] == "West")]
-					vc = st.radio("Choose the vaccination centre", west_pfizer_df.loc[:, "Name"].unique())
-
-					if vc == "Former Hong Kah Secondary School":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str('Hong Kah Secondary School') + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][0] # one and only
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup='FORMER HONG KAH SECONDARY SCHOOL').add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Nanyang Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Nanyang CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Clementi Community Centre":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Clementi CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Chua Chu Kang Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][2] # CCK CC from OneMapAPI in this 2nd index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-
-					else:
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						location_names = []
-						location_coordinates = []
-						length = data['found']
-
-						maximum = 1
-						if length == 1:
-							maximum = length
-						if length > 0:
-							for i in range(maximum):
-								results = data['results'][i]
-								location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-								location_names.append(results['SEARCHVAL'])
-
-							st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-								'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-								distance(convert_address(address_text), results['LATITUDE'],
-										 results['LONGITUDE'])) + "km**.")
-
-							m = folium.Map(location=location_coordinates[0], zoom_start=12)
-							# add markers
-							for point in range(0, maximum):
-								folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-								folium.Marker(convert_address(address_text), popup="Your Address",
-											  icon=folium.Icon(icon="home")).add_to(m)
-								folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-							# call to render Folium map in Streamlit
-							folium_static(m)
-
-							vc2 = vc.replace(" ", "+")
-							dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-							st.markdown(
-								"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-							st.markdown(dir_link, unsafe_allow_html=True)
-
-				elif vaccine_brand == "Moderna" and region == "Central":
-					central_moderna_df = df[(df["Vaccine Type"] == "Moderna") & (df["Region"] == "Central")]
-					vc = st.radio("Choose the vaccination centre", central_moderna_df.loc[:, "Name"].unique())
-
-					if vc == "Kolam Ayer Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Kolam Ayer CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					else:
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(
-							vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						location_names = []
-						location_coordinates = []
-						length = data['found']
-
-						maximum = 1
-						if length == 1:
-							maximum = length
-						if length > 0:
-							for i in range(maximum):
-								results = data['results'][i]
-								location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-								location_names.append(results['SEARCHVAL'])
-
-							st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-								'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-								distance(convert_address(address_text), results['LATITUDE'],
-										 results['LONGITUDE'])) + "km**.")
-
-							m = folium.Map(location=location_coordinates[0], zoom_start=12)
-							# add markers
-							for point in range(0, maximum):
-								folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-								folium.Marker(convert_address(address_text), popup="Your Address",
-											  icon=folium.Icon(icon="home")).add_to(m)
-								folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-							# call to render Folium map in Streamlit
-							folium_static(m)
-
-							vc2 = vc.replace(" ", "+")
-							dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-							st.markdown(
-								"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-							st.markdown(dir_link, unsafe_allow_html=True)
-
-				elif vaccine_brand == "Moderna" and region == "North":
-					north_moderna_df = df[(df["Vaccine Type"] == "Moderna") & (df["Region"] == "North")]
-					vc = st.radio("Choose the vaccination centre", north_moderna_df.loc[:, "Name"].unique())
-
-					if vc == "Marsiling Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][4] # Marsiling CC from OneMapAPI in this 4th index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					elif vc == "Woodlands Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][1] # Woodlands CC from OneMapAPI in this 1st index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					else:
-
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(
-							vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						location_names = []
-						location_coordinates = []
-						length = data['found']
-
-						maximum = 1
-						if length == 1:
-							maximum = length
-						if length > 0:
-							for i in range(maximum):
-								results = data['results'][i]
-								location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-								location_names.append(results['SEARCHVAL'])
-
-							st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-								'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-								distance(convert_address(address_text), results['LATITUDE'],
-										 results['LONGITUDE'])) + "km**.")
-
-							m = folium.Map(location=location_coordinates[0], zoom_start=12)
-							# add markers
-							for point in range(0, maximum):
-								folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-								folium.Marker(convert_address(address_text), popup="Your Address",
-											  icon=folium.Icon(icon="home")).add_to(m)
-								folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-							# call to render Folium map in Streamlit
-							folium_static(m)
-
-							vc2 = vc.replace(" ", "+")
-							dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-							st.markdown(
-								"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-							st.markdown(dir_link, unsafe_allow_html=True)
-
-				elif vaccine_brand == "Moderna" and region == "East":
-					east_moderna_df = df[(df["Vaccine Type"] == "Moderna") & (df["Region"] == "East")]
-					vc = st.radio("Choose the vaccination centre", east_moderna_df.loc[:, "Name"].unique())
-
-					if vc == "Tampines East Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][2] # Tampines East Community Club from OneMapAPI in this 2nd index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					else:
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						location_names = []
-						location_coordinates = []
-						length = data['found']
-
-						maximum = 1
-						if length == 1:
-							maximum = length
-						if length > 0:
-							for i in range(maximum):
-								results = data['results'][i]
-								location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-								location_names.append(results['SEARCHVAL'])
-
-							st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-								'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-								distance(convert_address(address_text), results['LATITUDE'],
-										 results['LONGITUDE'])) + "km**.")
-
-							m = folium.Map(location=location_coordinates[0], zoom_start=12)
-							# add markers
-							for point in range(0, maximum):
-								folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-								folium.Marker(convert_address(address_text), popup="Your Address",
-											  icon=folium.Icon(icon="home")).add_to(m)
-								folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-							# call to render Folium map in Streamlit
-							folium_static(m)
-
-							vc2 = vc.replace(" ", "+")
-							dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-							st.markdown(
-								"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-							st.markdown(dir_link, unsafe_allow_html=True)
-
-				elif vaccine_brand == "Moderna" and region == "North East":
-					northeast_moderna_df = df[(df["Vaccine Type"] == "Moderna") & (df["Region"] == "North East")]
-					vc = st.radio("Choose the vaccination centre", northeast_moderna_df.loc[:, "Name"].unique())
-
-					if vc == "Kebun Baru Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][3] # Kebun Baru Community CLub from OneMapAPI in this 3rd index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					else:
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						location_names = []
-						location_coordinates = []
-						length = data['found']
-
-						maximum = 1
-						if length == 1:
-							maximum = length
-						if length > 0:
-							for i in range(maximum):
-								results = data['results'][i]
-								location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-								location_names.append(results['SEARCHVAL'])
-
-							st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-								'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-								distance(convert_address(address_text), results['LATITUDE'],
-										 results['LONGITUDE'])) + "km**.")
-
-							m = folium.Map(location=location_coordinates[0], zoom_start=12)
-							# add markers
-							for point in range(0, maximum):
-								folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-								folium.Marker(convert_address(address_text), popup="Your Address",
-											  icon=folium.Icon(icon="home")).add_to(m)
-								folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-							# call to render Folium map in Streamlit
-							folium_static(m)
-
-							vc2 = vc.replace(" ", "+")
-							dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-							st.markdown(
-								"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-							st.markdown(dir_link, unsafe_allow_html=True)
-
-				elif vaccine_brand == "Moderna" and region == "West":
-					west_moderna_df = df[(df["Vaccine Type"] == "Moderna") & (df["Region"] == "West")]
-					vc = st.radio("Choose the vaccination centre", west_moderna_df.loc[:, "Name"].unique())
-
-					if vc == "Hong Kah North Community Club":
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						results = data['results'][4] # Hong Kah North Community CLub from OneMapAPI in this 4th index
-
-						st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-							'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-							distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km**.")
-
-						m = folium.Map(location=[results['LATITUDE'], results['LONGITUDE']], zoom_start=12)
-						# add markers
-						folium.Marker([results['LATITUDE'], results['LONGITUDE']], popup=results['SEARCHVAL']).add_to(m)
-						folium.Marker(convert_address(address_text), popup="Your Address",
-									  icon=folium.Icon(icon="home")).add_to(m)
-						folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-						# call to render Folium map in Streamlit
-						folium_static(m)
-
-						vc2 = vc.replace(" ", "+")
-						dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-						st.markdown(
-							"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-						st.markdown(dir_link, unsafe_allow_html=True)
-
-					else:
-						query_string = 'https://developers.onemap.sg/commonapi/search?searchVal=' + str(
-							vc) + '&returnGeom=Y&getAddrDetails=Y'
-						resp = requests.get(query_string)
-						data = json.loads(resp.content)
-
-						location_names = []
-						location_coordinates = []
-						length = data['found']
-
-						maximum = 1
-						if length == 1:
-							maximum = length
-						if length > 0:
-							for i in range(maximum):
-								results = data['results'][i]
-								location_coordinates.append([results['LATITUDE'], results['LONGITUDE']])
-								location_names.append(results['SEARCHVAL'])
-
-							st.markdown('The address of the selected vaccination centre is ' + "**" + results[
-								'ADDRESS'] + "**" + ' and the straight line distance from your house to your selected vaccination centre is ' + "**" + str(
-								distance(convert_address(address_text), results['LATITUDE'],
-										 results['LONGITUDE'])) + "km**.")
-
-							m = folium.Map(location=location_coordinates[0], zoom_start=12)
-							# add markers
-							for point in range(0, maximum):
-								folium.Marker(location_coordinates[point], popup=location_names[point]).add_to(m)
-								folium.Marker(convert_address(address_text), popup="Your Address",
-											  icon=folium.Icon(icon="home")).add_to(m)
-								folium.PolyLine([convert_address(address_text), [results['LATITUDE'], results['LONGITUDE']]], popup=str(distance(convert_address(address_text), results['LATITUDE'], results['LONGITUDE'])) + "km").add_to(m)
-							# call to render Folium map in Streamlit
-							folium_static(m)
-
-							vc2 = vc.replace(" ", "+")
-							dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
-							st.markdown(
-								"Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
-							st.markdown(dir_link, unsafe_allow_html=True)
-			except:
+						vc = st.radio("Choose the vaccination centre", centre_names, key="centre",
+									  format_func=lambda name: name + " (" + registry.vaccine_type_of(name) + ")")
+					prefetch_centres([name for name in centre_names if name != vc])
+
+					# walking / driving distances are offered when the offline road network has been built
+					distance_mode = "Straight line"
+					distance_modes = ["Straight line"] + [profile.capitalize() for profile in available_profiles()]
+					if len(distance_modes) > 1:
+						distance_mode = st.selectbox("Measure the distance by", distance_modes)
+					show_all_centres = st.checkbox("Show every vaccination centre on the map")
+
+					centre_text = st.empty()
+					map_section = st.beta_container()
+
+					vc2 = vc.replace(" ", "+")
+					dir_link = "https://www.google.com/maps/dir/" + address_text_plus + "/" + vc2
+					st.markdown("Click on this link to find out the direction from your address to the vaccination centre you have chosen:")
+					st.markdown(dir_link, unsafe_allow_html=True)
+
+					# a centre that cannot be located only costs its address, distance and map, the
+					# lists measured from the typed address are still shown
+					results = None
+					try:
+						results = locate_centre(vc).result()
+						centre_point = [results['LATITUDE'], results['LONGITUDE']]
+						centre_text.markdown('The address of the selected vaccination centre is ' + "**" + results['ADDRESS'] + "**.")
+					except LookupError:
+						centre_text.header("The location of the selected vaccination centre could not be found, please try again later")
+					except UpstreamError:
+						centre_text.header("The map service that locates the vaccination centres is not responding right now, please try again in a moment")
+				else:
+					results = None
+					st.markdown("There is no vaccination centre for the selected vaccine types and regions.")
+
+				origin = origin_task.result()
+
+				with nearest_section:
+					# the nearest centre of each chosen vaccine type comes straight from the precomputed
+					# grid when it has been built, otherwise from the spatial index; the grid's stored distance
+					# is measured from the centre of the address's cell, at most half a cell diagonal off
+					grid = get_nearest_grid(registry)
+					for vaccine_type in vaccine_brands:
+						found = grid.lookup(origin, vaccine_type) if grid is not None else None
+						if found is not None:
+							nearest_name = registry.names[found[0]]
+							nearest_km = round(found[1], 2)
+						else:
+							found = registry.nearest_of_type(origin, 1, [vaccine_type])
+							if not found:
+								continue
+							nearest_name, nearest_km = found[0]
+						st.markdown("The nearest " + vaccine_type + " vaccination centre to your address is **" + nearest_name +
+									"**, " + str(nearest_km) + "km away.")
+
+					nearest = registry.nearest(origin, NEAREST_CENTRES, vaccine_brands, regions)
+					if nearest:
+						st.subheader("Nearest vaccination centres to you")
+						st.markdown("\n".join(
+							str(rank) + ". " + name + " - " + str(km) + "km" for rank, (name, km) in enumerate(nearest, 1)))
+
+						radius = st.number_input("Show every centre of your chosen vaccine type within this distance of your address (km)",
+												 min_value=0.0, max_value=50.0, value=0.0, step=0.5)
+						if radius > 0:
+							nearby = registry.within(origin, radius, vaccine_brands)
+							if nearby:
+								st.markdown("\n".join("- " + name + " - " + str(km) + "km" for name, km in nearby))
+							else:
+								st.markdown("There is no vaccination centre within " + str(radius) + "km of your address.")
+
+					# door-to-door public transport times when a GTFS feed has been built with transit.py
+					transit_network = get_transit_network()
+					if transit_network is not None and centre_names:
+						now = datetime.now(SINGAPORE_TIME)
+						departure_time = now.hour * 3600 + now.minute * 60 + now.second
+						rows = [registry.index_of(name) for name in centre_names]
+						times = transit_network.travel_times(
+							origin, [[registry.latitudes[row], registry.longitudes[row]] for row in rows], departure_time, now.date())
+						# centres as quick to walk to are left out, walking is not public transport
+						fastest = sorted((time, name) for (time, by_transit), name in zip(times, centre_names) if by_transit)
+						if fastest:
+							st.subheader("Fastest vaccination centres to reach by public transport")
+							st.markdown("\n".join(
+								str(rank) + ". " + name + " - about " + str(int(round(time / 60))) + " min" for rank, (time, name) in
+								enumerate(fastest[:NEAREST_CENTRES], 1)))
+
+				if results is not None:
+					# the road route is searched in the background: the straight line is drawn first and
+					# replaced by the route once it is found, routes from the cache skip the straight line
+					route_task = None
+					if distance_mode != "Straight line":
+						route_task = find_route(distance_mode.lower(), origin, centre_point)
+						futures.wait([route_task], timeout=ROUTE_WAIT)
+					with map_section:
+						map_slot = st.empty()
+					drawn = False
+					while True:
+						routing = route_task is not None and not route_task.done()
+						route = route_task.result() if route_task is not None and not routing else None
+						if route is not None:
+							centre_distance, route_points = route
+							distance_label = distance_mode.lower()
+						elif drawn:
+							# no road route, the straight line is already on the page
+							break
+						else:
+							centre_distance = distance(origin, results['LATITUDE'], results['LONGITUDE'])
+							route_points = [origin, centre_point]
+							distance_label = "straight line"
+
+						centre_text.markdown('The address of the selected vaccination centre is ' + "**" + results[
+							'ADDRESS'] + "**" + ' and the ' + distance_label + ' distance from your house to your selected vaccination centre is ' + "**" + str(
+							centre_distance) + "km**." + (" The " + distance_mode.lower() + " route is being calculated." if routing else ""))
+
+						with map_slot:
+							if map_display == MAP_IMAGE:
+								st.image(static_map_renderer.render(vc, centre_point, origin, route_points, distance_label),
+										 caption="Red: " + vc + ", black: your address", output_format="PNG")
+							elif map_display == "Live map":
+								# a single component per session, drawn once the route is known
+								if not routing:
+									live_map(live_map_state(registry, vc, centre_point, origin, route_points, centre_distance,
+															all_centres=show_all_centres))
+							else:
+								# the base map comes from the render cache, only the home marker and route are added
+								map_html = map_cache.render(registry, vc, centre_point, origin, route_points, centre_distance,
+															all_centres=show_all_centres)
+								# call to render the Folium map in Streamlit
+								components.html(map_html, width=MAP_WIDTH, height=MAP_HEIGHT + 10)
+						drawn = True
+						if not routing:
+							break
+						futures.wait([route_task])
+			except AddressNotFound:
 				st.header("Please type a valid address")
+			except UpstreamError:
+				st.header("The address lookup service is not responding right now, please try again in a moment")
 
 	st.sidebar.markdown("")
 	st.sidebar.markdown("")
@@ -0,0 +1,65 @@
+import random
+import sys
+import time
+
+from centres import get_registry
+from maps import MapRenderCache, all_centres_map, centre_map, render_html
+
+
+# Map-build time per request with and without the render cache:
+#     python benchmark_maps.py [requests]
+#
+# Each request picks a random centre and a random home address in Singapore, like a user
+# switching between centres. "rebuild" builds and serialises the whole folium map the way the
+# app did before the render cache; "cached" splices the overlays into the cached base map,
+# with the time to build each base map for the first time included.
+
+
+def random_origin(rng):
+	return [rng.uniform(1.28, 1.44), rng.uniform(103.68, 103.98)]
+
+
+def requests_for(registry, count, seed=0):
+	rng = random.Random(seed)
+	rows = [i for i, name in enumerate(registry.names) if registry.has_location(name)]
+	for _ in range(count):
+		i = rng.choice(rows)
+		centre_point = [float(registry.latitudes[i]), float(registry.longitudes[i])]
+		origin = random_origin(rng)
+		yield registry.names[i], centre_point, origin, [origin, centre_point], round(rng.uniform(1, 25), 2)
+
+
+def timed(fn, requests):
+	sizes = []
+	started = time.perf_counter()
+	for request in requests:
+		sizes.append(len(fn(*request)))
+	elapsed = time.perf_counter() - started
+	return elapsed / len(requests) * 1000, sum(sizes) / len(sizes)
+
+
+def main(count=500):
+	registry = get_registry()
+	requests = list(requests_for(registry, int(count)))
+	if not requests:
+		sys.exit("No centre has coordinates, build Vaccination_Centres_compiled.csv with build_centres.py first")
+
+	for all_centres in (False, True):
+		if all_centres:
+			rebuild = lambda *request: render_html(all_centres_map(registry, *request))
+		else:
+			rebuild = lambda *request: render_html(centre_map(*request))
+		cache = MapRenderCache()
+		cached = lambda *request: cache.render(registry, *request, all_centres=all_centres)
+
+		rebuild_ms, rebuild_size = timed(rebuild, requests)
+		cached_ms, cached_size = timed(cached, requests)
+		print("%s map, %d requests over %d centres" % ("all centres" if all_centres else "selected centre",
+														len(requests), len(set(request[0] for request in requests))))
+		print("  rebuild: %7.3f ms/request, %6.0f bytes" % (rebuild_ms, rebuild_size))
+		print("  cached:  %7.3f ms/request, %6.0f bytes (%d base maps built)" % (cached_ms, cached_size, cache.misses))
+		print("  saved:   %7.3f ms/request (%.0fx faster)" % (rebuild_ms - cached_ms, rebuild_ms / cached_ms))
+
+
+if __name__ == '__main__':
+	main(*sys.argv[1:2])
@@ -0,0 +1,64 @@
+import random
+import sys
+import time
+
+from benchmark_maps import random_origin
+from centres import get_registry
+from distances import distance
+from routing import available_profiles, get_road_graph
+
+
+# Route latency on the built road network, first request and repeated:
+#     python benchmark_routes.py [requests]
+#
+# Each request routes from a random home address in Singapore to a random centre. "first" is
+# A* on a cold route cache, "repeated" is the same requests again (a rerun of the page, or a
+# user switching back to a centre), answered from the route cache. First requests are grouped
+# by their straight-line distance, since A* explores more of the graph the further it goes.
+
+DISTANCE_BANDS = ((0, 5), (5, 10), (10, 20), (20, 50))
+
+
+def percentile(values, fraction):
+	values = sorted(values)
+	return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main(count=200):
+	registry = get_registry()
+	rows = [i for i, name in enumerate(registry.names) if registry.has_location(name)]
+	if not rows:
+		sys.exit("No centre has coordinates, build Vaccination_Centres_compiled.csv with build_centres.py first")
+	profiles = available_profiles()
+	if not profiles:
+		sys.exit("No road network has been built, see routing.py")
+
+	rng = random.Random(0)
+	requests = []
+	for _ in range(int(count)):
+		i = rng.choice(rows)
+		requests.append((random_origin(rng), [float(registry.latitudes[i]), float(registry.longitudes[i])]))
+
+	for profile in profiles:
+		graph = get_road_graph(profile)
+		first = []
+		for origin, centre_point in requests:
+			started = time.perf_counter()
+			graph.route(origin, centre_point)
+			first.append((distance(origin, *centre_point), (time.perf_counter() - started) * 1000))
+		started = time.perf_counter()
+		for origin, centre_point in requests:
+			graph.route(origin, centre_point)
+		repeated_ms = (time.perf_counter() - started) * 1000 / len(requests)
+
+		print("%s, %d nodes, %d requests" % (profile, len(graph), len(requests)))
+		for low, high in DISTANCE_BANDS:
+			times = [ms for km, ms in first if low <= km < high]
+			if times:
+				print("  first, %2d-%2d km: median %8.1f ms, p95 %8.1f ms, max %8.1f ms (%d requests)" % (
+					low, high, percentile(times, 0.5), percentile(times, 0.95), max(times), len(times)))
+		print("  repeated:       %8.3f ms/request (%d cache hits)" % (repeated_ms, graph.hits))
+
+
+if __name__ == '__main__':
+	main(*sys.argv[1:2])
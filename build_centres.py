@@ -0,0 +1,100 @@
+import csv
+import os
+import re
+import sys
+
+from centres import CENTRES_PATH, COMPILED_CENTRES_PATH, COMPILED_COLUMNS, in_singapore, validate_compiled_rows
+from onemap import onemap_client
+from upstream import UpstreamError
+
+
+# Build step that resolves every vaccination centre once and writes the compiled artifact
+# the app reads at request time:
+#     python build_centres.py [Vaccination_Centres.csv] [Vaccination_Centres_compiled.csv]
+#
+# The artifact is meant to be committed with the centre list. A deployment without it (the
+# hosted app has no build step) runs compile_centres once in the background, see
+# centres.get_registry.
+#
+# Centres are looked up by the postal code in their MOH address rather than by name, and
+# the OneMap result whose postal code matches is used, so the build does not depend on
+# the order in which OneMap happens to return its results.
+
+POSTAL_RE = re.compile(r"Singapore\s+(\d{6})")
+
+
+def pick_result(results, postal, block):
+	matches = [result for result in results if result.get("POSTAL") == postal]
+	# several buildings can share a postal code, prefer the one with the same block number
+	for result in matches:
+		if block and result.get("BLK_NO") == block:
+			return result
+	return matches[0] if matches else None
+
+
+def resolve_centre(row):
+	address = row["Address"]
+	match = POSTAL_RE.search(address)
+	if not match:
+		raise ValueError("no postal code in the address of " + repr(row["Name"]))
+	postal = match.group(1)
+	block = address.split(" ", 1)[0]
+	result = pick_result(onemap_client.search(postal).get("results", []), postal, block)
+	if result is None:
+		result = pick_result(onemap_client.search(row["Name"]).get("results", []), postal, block)
+	if result is None:
+		raise ValueError("OneMap has no result with postal code %s for %r" % (postal, row["Name"]))
+	lat = float(result["LATITUDE"])
+	lon = float(result["LONGITUDE"])
+	if not in_singapore(lat, lon):
+		raise ValueError("OneMap placed %r outside Singapore" % row["Name"])
+	return {
+		"Name": row["Name"],
+		"Address": address,
+		"Vaccine Type": row["Vaccine Type"],
+		"Region": row["Region"],
+		"Postal": postal,
+		"Latitude": repr(lat),
+		"Longitude": repr(lon),
+		"Canonical Address": result["ADDRESS"],
+	}
+
+
+def compile_centres(source=CENTRES_PATH, target=COMPILED_CENTRES_PATH):
+	# returns the problems found, in which case target is left untouched
+	with open(source, newline="", encoding="utf-8-sig") as f:
+		rows = list(csv.DictReader(f))
+
+	compiled = []
+	errors = []
+	for row in rows:
+		try:
+			compiled.append(resolve_centre(row))
+		except (UpstreamError, ValueError, KeyError) as e:
+			errors.append(str(e))
+
+	errors.extend(validate_compiled_rows(compiled, [row["Name"] for row in rows]))
+	if errors:
+		return errors
+
+	# written next to the target and renamed, the app may be reading it at the same time
+	partial = target + ".partial"
+	with open(partial, "w", newline="", encoding="utf-8") as f:
+		writer = csv.DictWriter(f, fieldnames=COMPILED_COLUMNS)
+		writer.writeheader()
+		writer.writerows(compiled)
+	os.replace(partial, target)
+	return []
+
+
+def main(source=CENTRES_PATH, target=COMPILED_CENTRES_PATH):
+	errors = compile_centres(source, target)
+	if errors:
+		for error in errors:
+			print("error: " + error, file=sys.stderr)
+		sys.exit("Not writing " + target + ", %d problem(s) found" % len(errors))
+	print("Compiled centres into " + target)
+
+
+if __name__ == '__main__':
+	main(*sys.argv[1:3])
@@ -0,0 +1,246 @@
+import os
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from distances import distance_matrix, distances_from, rank
+from spatial_index import CentreSpatialIndex
+from tasks import io_pool
+
+
+# Vaccination centre data.
+#
+# build_centres.py resolves every row of Vaccination_Centres.csv once through OneMap and
+# writes Vaccination_Centres_compiled.csv with the coordinates and canonical address of
+# each centre. The registry below prefers that file so that picking a centre needs no
+# network call, and falls back to the plain CSV (without coordinates) when it is missing
+# while building the compiled file in the background.
+
+CENTRES_PATH = "Vaccination_Centres.csv"
+COMPILED_CENTRES_PATH = "Vaccination_Centres_compiled.csv"
+
+COMPILED_COLUMNS = ["Name", "Address", "Vaccine Type", "Region", "Postal", "Latitude", "Longitude",
+					"Canonical Address"]
+
+# bounding box of Singapore, used to reject results that geocoded somewhere else
+SG_LAT_RANGE = (1.15, 1.48)
+SG_LON_RANGE = (103.59, 104.10)
+
+
+def in_singapore(lat, lon):
+	return SG_LAT_RANGE[0] <= lat <= SG_LAT_RANGE[1] and SG_LON_RANGE[0] <= lon <= SG_LON_RANGE[1]
+
+
+def validate_compiled_rows(rows, source_names=None):
+	# returns a list of problems, empty when the artifact is usable
+	problems = []
+	seen = set()
+	for row in rows:
+		name = row.get("Name", "")
+		if name in seen:
+			problems.append("duplicate centre " + repr(name))
+		seen.add(name)
+		try:
+			lat = float(row["Latitude"])
+			lon = float(row["Longitude"])
+		except (KeyError, TypeError, ValueError):
+			problems.append("missing coordinates for " + repr(name))
+			continue
+		if not in_singapore(lat, lon):
+			problems.append("coordinates of %r are outside Singapore: %s, %s" % (name, lat, lon))
+		if not row.get("Canonical Address"):
+			problems.append("missing canonical address for " + repr(name))
+	if source_names is not None:
+		for name in sorted(set(source_names) - seen):
+			problems.append("centre " + repr(name) + " is missing from the compiled file")
+	return problems
+
+
+class CentreRegistry:
+
+	# Immutable, column-oriented view of the vaccination centres shared by every session.
+	# Names and addresses are object arrays, vaccine types and regions are small integer
+	# codes into their category tuples, and coordinates are float64 arrays (NaN for
+	# centres that are not in the compiled dataset yet).
+
+	def __init__(self, frame):
+		self.names = _frozen(frame["Name"].to_numpy(dtype=object))
+		self.addresses = _frozen(frame["Address"].to_numpy(dtype=object))
+		vaccine_types = pd.Categorical(frame["Vaccine Type"], categories=pd.unique(frame["Vaccine Type"]))
+		regions = pd.Categorical(frame["Region"], categories=pd.unique(frame["Region"]))
+		self.vaccine_types = tuple(vaccine_types.categories)
+		self.regions = tuple(regions.categories)
+		self.vaccine_codes = _frozen(vaccine_types.codes.astype(np.int8))
+		self.region_codes = _frozen(regions.codes.astype(np.int8))
+		self.latitudes = _frozen(_float_column(frame, "Latitude"))
+		self.longitudes = _frozen(_float_column(frame, "Longitude"))
+		self.lat_radians = _frozen(np.radians(self.latitudes))
+		self.lon_radians = _frozen(np.radians(self.longitudes))
+		self.spatial_index = CentreSpatialIndex(self.lat_radians, self.lon_radians, self.vaccine_codes)
+		if "Canonical Address" in frame:
+			canonical = frame["Canonical Address"].fillna("").to_numpy(dtype=object)
+		else:
+			canonical = np.full(len(frame), "", dtype=object)
+		self.canonical_addresses = _frozen(canonical)
+		self._index = {name: i for i, name in enumerate(self.names)}
+		# precomputed row lists per vaccine type, per region and per (vaccine type, region)
+		# pair, so a filter costs O(result) instead of a mask over every centre
+		self._by_vaccine = _group_rows(self.vaccine_codes, len(self.vaccine_types))
+		self._by_region = _group_rows(self.region_codes, len(self.regions))
+		self._by_pair = {}
+		for i, pair in enumerate(zip(self.vaccine_codes.tolist(), self.region_codes.tolist())):
+			self._by_pair.setdefault(pair, []).append(i)
+		self._by_pair = {pair: tuple(rows) for pair, rows in self._by_pair.items()}
+
+	def __len__(self):
+		return len(self.names)
+
+	def __contains__(self, name):
+		return name in self._index
+
+	def index_of(self, name):
+		return self._index[name]
+
+	def vaccine_type_of(self, name):
+		return self.vaccine_types[self.vaccine_codes[self._index[name]]]
+
+	def region_of(self, name):
+		return self.regions[self.region_codes[self._index[name]]]
+
+	def rows_for(self, vaccine_types=None, regions=None):
+		# row indices of the centres matching any of the given vaccine types and any of the
+		# given regions, in dataset order; None or an empty selection means no filter
+		vaccine_codes = self._codes(self.vaccine_types, vaccine_types)
+		region_codes = self._codes(self.regions, regions)
+		if vaccine_codes is None and region_codes is None:
+			return list(range(len(self.names)))
+		if region_codes is None:
+			groups = [self._by_vaccine[code] for code in vaccine_codes]
+		elif vaccine_codes is None:
+			groups = [self._by_region[code] for code in region_codes]
+		else:
+			groups = [self._by_pair.get((v, r), ()) for v in vaccine_codes for r in region_codes]
+		if len(groups) == 1:
+			return list(groups[0])
+		return sorted(i for group in groups for i in group)
+
+	def query(self, vaccine_types=None, regions=None):
+		return [self.names[i] for i in self.rows_for(vaccine_types, regions)]
+
+	def names_for(self, vaccine_type, region):
+		return self.query([vaccine_type], [region])
+
+	def distances_from(self, origin):
+		# km from the origin to every centre in row order, NaN where the location is unknown
+		return distances_from(origin, self.lat_radians, self.lon_radians)
+
+	def distance_matrix(self, origins):
+		return distance_matrix(origins, self.lat_radians, self.lon_radians)
+
+	def nearest(self, origin, n=5, vaccine_types=None, regions=None):
+		# [(centre name, km), ...] for the n nearest centres matching the filters
+		rows = self.rows_for(vaccine_types, regions)
+		ranked = rank(self.distances_from(origin), n, rows)
+		return [(self.names[row], round(km, 2)) for row, km in ranked]
+
+	def nearest_of_type(self, origin, k=5, vaccine_types=None):
+		# k nearest centres of the given vaccine types anywhere in Singapore, via the spatial index
+		ranked = self.spatial_index.nearest(origin, k, self._codes(self.vaccine_types, vaccine_types))
+		return [(self.names[row], round(km, 2)) for row, km in ranked]
+
+	def within(self, origin, km, vaccine_types=None):
+		# every centre of the given vaccine types within km of the origin, nearest first
+		ranked = self.spatial_index.within(origin, km, self._codes(self.vaccine_types, vaccine_types))
+		return [(self.names[row], round(dist, 2)) for row, dist in ranked]
+
+	@staticmethod
+	def _codes(categories, selected):
+		if not selected:
+			return None
+		if isinstance(selected, str):
+			selected = [selected]
+		# unknown values simply match nothing
+		return sorted({categories.index(value) for value in selected if value in categories})
+
+	def has_location(self, name):
+		return not np.isnan(self.latitudes[self._index[name]])
+
+	def location(self, name):
+		# OneMap-style result for a compiled centre, None when it still needs a live lookup
+		i = self._index.get(name)
+		if i is None or np.isnan(self.latitudes[i]):
+			return None
+		return {
+			"SEARCHVAL": name.upper(),
+			"ADDRESS": self.canonical_addresses[i],
+			"LATITUDE": str(self.latitudes[i]),
+			"LONGITUDE": str(self.longitudes[i]),
+		}
+
+
+def _group_rows(codes, size):
+	groups = [[] for _ in range(size)]
+	for i, code in enumerate(codes.tolist()):
+		groups[code].append(i)
+	return [tuple(rows) for rows in groups]
+
+
+def _frozen(array):
+	array.flags.writeable = False
+	return array
+
+
+def _float_column(frame, column):
+	if column not in frame:
+		return np.full(len(frame), np.nan, dtype=np.float64)
+	return frame[column].to_numpy(dtype=np.float64)
+
+
+def load_registry(path=CENTRES_PATH, compiled_path=COMPILED_CENTRES_PATH):
+	if os.path.exists(compiled_path):
+		frame = pd.read_csv(compiled_path, dtype={"Postal": str})
+		problems = validate_compiled_rows(frame.to_dict("records"))
+		if problems:
+			raise ValueError(compiled_path + " is invalid, rebuild it with build_centres.py: " + "; ".join(problems))
+	else:
+		frame = pd.read_csv(path)
+	return CentreRegistry(frame)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def _compile_in_background():
+	# imported here, build_centres imports this module
+	from build_centres import compile_centres
+	global _registry
+	try:
+		problems = compile_centres()
+	except Exception as e:
+		problems = [repr(e)]
+	if problems:
+		warnings.warn("Could not build " + COMPILED_CENTRES_PATH + ", the centres stay without coordinates "
+					  "until the app restarts: " + "; ".join(problems[:5]), RuntimeWarning)
+		return
+	# sessions that already hold the old registry keep it for their current run
+	with _registry_lock:
+		_registry = load_registry()
+
+
+def get_registry():
+	# loaded once per process; Streamlit reruns app.py but keeps imported modules
+	global _registry
+	if _registry is None:
+		with _registry_lock:
+			if _registry is None:
+				if not os.path.exists(COMPILED_CENTRES_PATH):
+					# once per process, like the load itself
+					warnings.warn(COMPILED_CENTRES_PATH + " is missing: building it from OneMap in the background, "
+								  "until then the nearest-centre lists stay empty and every selected centre is looked "
+								  "up through OneMap. Commit it after running: python build_centres.py", RuntimeWarning)
+					io_pool.submit(_compile_in_background)
+				_registry = load_registry()
+	return _registry
@@ -0,0 +1,2 @@
+# Makes the app modules at the root of the repository importable from tests/ under plain
+# `pytest` as well as `python -m pytest`.
@@ -0,0 +1,15 @@
+import os
+
+import streamlit.components.v1 as components
+
+
+# Invisible component that reports the browser's connection type (see lite.py).
+
+COMPONENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "connection_component")
+
+_connection_probe = components.declare_component("connection_probe", path=COMPONENT_PATH)
+
+
+def connection_info():
+	# {"effective_type": "4g", "save_data": False}, or None until the browser has answered
+	return _connection_probe(key="connection_probe", default=None)
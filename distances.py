@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+
+
+# Great-circle (haversine) distances in km. `distance` is the scalar helper the app has
+# always used for one pair of points; the NumPy kernels below compute the distance from
+# one or many origins to every centre in a single vectorised pass.
+
+EARTH_RADIUS_KM = 6371
+
+
+def distance(origin, lat2, lon2):
+	lat1 = float(origin[0])
+	lon1 = float(origin[1])
+	lat2 = float(lat2)
+	lon2 = float(lon2)
+	radius = EARTH_RADIUS_KM  # km
+
+	dlat = math.radians(lat2 - lat1)
+	dlon = math.radians(lon2 - lon1)
+	a = math.sin(dlat / 2) * math.sin(dlat / 2) + math.cos(math.radians(lat1)) \
+		* math.cos(math.radians(lat2)) * math.sin(dlon / 2) * math.sin(dlon / 2)
+	c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+	d = radius * c
+	d = round(d,2)
+	return d
+
+
+def haversine_radians(lat1, lon1, lat2, lon2):
+	# all arguments in radians and broadcastable against each other
+	sin_dlat = np.sin((lat2 - lat1) * 0.5)
+	sin_dlon = np.sin((lon2 - lon1) * 0.5)
+	a = sin_dlat * sin_dlat + np.cos(lat1) * np.cos(lat2) * sin_dlon * sin_dlon
+	return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def distances_from(origin, lat_radians, lon_radians):
+	# km from one [lat, lon] origin (degrees) to every centre; NaN for centres without coordinates
+	lat1, lon1 = np.radians(np.asarray(origin, dtype=np.float64))
+	return haversine_radians(lat1, lon1, lat_radians, lon_radians)
+
+
+def distance_matrix(origins, lat_radians, lon_radians):
+	# km from each of N origins (an N x 2 array of [lat, lon] degrees) to each of M centres, N x M
+	origins = np.radians(np.asarray(origins, dtype=np.float64).reshape(-1, 2))
+	return haversine_radians(origins[:, :1], origins[:, 1:], lat_radians[np.newaxis, :], lon_radians[np.newaxis, :])
+
+
+def rank(distances, n=None, rows=None):
+	# [(row, km), ...] nearest first, skipping centres whose distance is unknown
+	distances = np.asarray(distances)
+	if rows is None:
+		rows = np.arange(len(distances))
+	else:
+		rows = np.asarray(rows, dtype=np.intp)
+	candidates = distances[rows]
+	known = ~np.isnan(candidates)
+	rows, candidates = rows[known], candidates[known]
+	if n is not None and n < len(rows):
+		# only the n smallest need sorting
+		keep = np.argpartition(candidates, n)[:n]
+		rows, candidates = rows[keep], candidates[keep]
+	order = np.argsort(candidates, kind="stable")
+	return [(int(row), float(km)) for row, km in zip(rows[order], candidates[order])]
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+# Persistent geocode cache shared by every session and process of the app.
+# Addresses are keyed by a hash of their normalised text, so that "108 Punggol Field" and
+# "108  punggol field," hit the same row while the typed addresses themselves are never
+# written to disk. Rows expire after `ttl` seconds and the least recently used rows are
+# evicted once the table grows past `max_entries`.
+
+DEFAULT_TTL = 30 * 24 * 60 * 60  # 30 days
+DEFAULT_MAX_ENTRIES = 50000
+# caches written before the keys were hashed (user_version 0) are emptied on open
+SCHEMA_VERSION = 1
+
+
+def normalise_address(address):
+	text = re.sub(r"[^\w#/\- ]", " ", str(address).lower())
+	return " ".join(text.split())
+
+
+def address_key(address):
+	return hashlib.blake2b(normalise_address(address).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class GeocodeCache:
+
+	def __init__(self, path, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+		self.path = path
+		self.ttl = ttl
+		self.max_entries = max_entries
+		self.hits = 0
+		self.misses = 0
+		self._local = threading.local()
+		self._lock = threading.Lock()
+		conn = self._connect()
+		conn.executescript(
+			"CREATE TABLE IF NOT EXISTS geocode ("
+			" key TEXT PRIMARY KEY,"
+			" lat REAL NOT NULL,"
+			" lon REAL NOT NULL,"
+			" created REAL NOT NULL,"
+			" accessed REAL NOT NULL);"
+			"CREATE INDEX IF NOT EXISTS geocode_accessed ON geocode (accessed);"
+		)
+		if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+			# older rows are keyed by the address text: drop them and the pages they were on
+			conn.execute("DELETE FROM geocode")
+			conn.execute("VACUUM")
+			conn.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+
+	def _connect(self):
+		# sqlite connections cannot be shared across threads and Streamlit runs
+		# every session on its own script thread, so keep one connection per thread
+		conn = getattr(self._local, "conn", None)
+		if conn is None:
+			directory = os.path.dirname(os.path.abspath(self.path))
+			os.makedirs(directory, exist_ok=True)
+			conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.execute("PRAGMA synchronous=NORMAL")
+			self._local.conn = conn
+		return conn
+
+	def _count(self, hit):
+		with self._lock:
+			if hit:
+				self.hits += 1
+			else:
+				self.misses += 1
+
+	def get(self, address):
+		key = address_key(address)
+		now = time.time()
+		conn = self._connect()
+		row = conn.execute("SELECT lat, lon, created FROM geocode WHERE key = ?", (key,)).fetchone()
+		if row is None:
+			self._count(False)
+			return None
+		lat, lon, created = row
+		if self.ttl is not None and now - created > self.ttl:
+			conn.execute("DELETE FROM geocode WHERE key = ?", (key,))
+			self._count(False)
+			return None
+		conn.execute("UPDATE geocode SET accessed = ? WHERE key = ?", (now, key))
+		self._count(True)
+		return [lat, lon]
+
+	def put(self, address, point):
+		key = address_key(address)
+		now = time.time()
+		conn = self._connect()
+		conn.execute(
+			"INSERT OR REPLACE INTO geocode (key, lat, lon, created, accessed) VALUES (?, ?, ?, ?, ?)",
+			(key, float(point[0]), float(point[1]), now, now))
+		self._evict(conn)
+
+	def _evict(self, conn):
+		if self.max_entries is None:
+			return
+		excess = conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0] - self.max_entries
+		if excess > 0:
+			conn.execute(
+				"DELETE FROM geocode WHERE key IN (SELECT key FROM geocode ORDER BY accessed LIMIT ?)",
+				(excess,))
+
+	def purge_expired(self):
+		if self.ttl is None:
+			return 0
+		cursor = self._connect().execute("DELETE FROM geocode WHERE created < ?", (time.time() - self.ttl,))
+		return cursor.rowcount
+
+	def clear(self):
+		self._connect().execute("DELETE FROM geocode")
+
+	def __len__(self):
+		return self._connect().execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+
+	def stats(self):
+		with self._lock:
+			hits, misses = self.hits, self.misses
+		lookups = hits + misses
+		return {
+			"entries": len(self),
+			"hits": hits,
+			"misses": misses,
+			"hit_rate": hits / lookups if lookups else 0.0,
+		}
@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from geopy.exc import GeocoderQueryError, GeocoderServiceError
+
+from centres import in_singapore
+from upstream import UpstreamError
+
+
+# Pluggable geocoder backends and a hedged strategy across them.
+#
+# A backend turns an address into [lat, lon], returns None when it does not know the address
+# and raises UpstreamError when the service itself failed. HedgedGeocoder asks the primary
+# backend first; if no answer has arrived after the primary's recent p95 latency it also asks
+# the secondaries, and the first result inside Singapore wins. Slow primary responses thus
+# cost at most one p95 plus the secondary's latency instead of the primary's tail.
+#
+# Every backend takes the URL of its service, so it can be pointed at a local stub server.
+
+HEDGE_QUANTILE = 0.95
+MIN_HEDGE_DELAY = 0.05
+DEFAULT_HEDGE_DELAY = 1.0
+LATENCY_SAMPLES = 200
+TIMEOUT = 15.0
+
+
+class NominatimBackend:
+
+	name = "Nominatim"
+
+	def __init__(self, geolocator, gateway):
+		# geolocator: a geopy Nominatim client (its domain/scheme select the server)
+		self.geolocator = geolocator
+		self.gateway = gateway
+
+	def geocode(self, address, key=None):
+		try:
+			location = self.gateway.call(key or address, lambda: self.geolocator.geocode(address))
+		except GeocoderQueryError:
+			return None
+		except GeocoderServiceError as e:
+			raise UpstreamError("Nominatim rejected the request: " + str(e)) from e
+		if location is None:
+			return None
+		return [location.latitude, location.longitude]
+
+
+class OneMapBackend:
+
+	name = "OneMap"
+
+	def __init__(self, client):
+		# client: an onemap.OneMapClient (its url selects the server)
+		self.client = client
+
+	def geocode(self, address, key=None):
+		try:
+			data = self.client.search(address)
+		except UpstreamError:
+			raise
+		except Exception as e:
+			raise UpstreamError("OneMap search failed: " + str(e)) from e
+		results = data.get("results") or []
+		if not results:
+			return None
+		return [float(results[0]["LATITUDE"]), float(results[0]["LONGITUDE"])]
+
+
+class OfflineBackend:
+
+	name = "Offline index"
+
+	def __init__(self, geocoder):
+		self.geocoder = geocoder
+
+	def geocode(self, address, key=None):
+		return self.geocoder.geocode(address)
+
+
+class LatencyTracker:
+
+	def __init__(self, samples=LATENCY_SAMPLES):
+		self._samples = deque(maxlen=samples)
+		self._lock = threading.Lock()
+
+	def record(self, seconds):
+		with self._lock:
+			self._samples.append(seconds)
+
+	def quantile(self, q, default):
+		with self._lock:
+			samples = sorted(self._samples)
+		if len(samples) < 10:
+			return default
+		return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class HedgedGeocoder:
+
+	def __init__(self, primary, secondaries, executor=None, quantile=HEDGE_QUANTILE, min_delay=MIN_HEDGE_DELAY,
+				 default_delay=DEFAULT_HEDGE_DELAY, timeout=TIMEOUT):
+		self.primary = primary
+		self.secondaries = list(secondaries)
+		self.executor = executor or ThreadPoolExecutor(max_workers=8, thread_name_prefix="geocode")
+		self.quantile = quantile
+		self.min_delay = min_delay
+		self.default_delay = default_delay
+		self.timeout = timeout
+		self.latency = LatencyTracker()
+		self.hedged = 0
+		self.wins = {}
+		self._lock = threading.Lock()
+
+	def hedge_delay(self):
+		return max(self.min_delay, self.latency.quantile(self.quantile, self.default_delay))
+
+	def _timed(self, backend, address, key):
+		started = time.monotonic()
+		result = backend.geocode(address, key)
+		if backend is self.primary:
+			self.latency.record(time.monotonic() - started)
+		return result
+
+	def _win(self, backend):
+		with self._lock:
+			self.wins[backend.name] = self.wins.get(backend.name, 0) + 1
+
+	def geocode(self, address, key=None):
+		# first in-country [lat, lon] from any backend, None if every backend answered without
+		# one, UpstreamError if none answered and at least one failed
+		deadline = time.monotonic() + self.timeout
+		pending = {self.executor.submit(self._timed, self.primary, address, key): self.primary}
+		hedge_at = time.monotonic() + self.hedge_delay()
+		hedged = False
+		errors = []
+		while pending:
+			if hedged:
+				timeout = deadline - time.monotonic()
+			else:
+				timeout = min(hedge_at, deadline) - time.monotonic()
+			done, _ = wait(pending, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+			for future in done:
+				backend = pending.pop(future)
+				try:
+					point = future.result()
+				except UpstreamError as e:
+					errors.append(e)
+					continue
+				if point is not None and in_singapore(point[0], point[1]):
+					self._win(backend)
+					for other in pending:
+						other.cancel()
+					return point
+			if not hedged and (not pending or time.monotonic() >= hedge_at):
+				# the primary is slow or came back empty: ask the secondaries as well
+				hedged = True
+				if pending:
+					with self._lock:
+						self.hedged += 1
+				for backend in self.secondaries:
+					pending[self.executor.submit(self._timed, backend, address, key)] = backend
+			elif time.monotonic() >= deadline:
+				break
+		if errors:
+			raise errors[0]
+		if pending:
+			raise UpstreamError("no geocoder answered within %gs" % self.timeout)
+		return None
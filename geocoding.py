@@ -0,0 +1,48 @@
+import os
+
+from geopy.geocoders import Nominatim
+
+from geocode_cache import GeocodeCache, normalise_address
+from geocoder_backends import HedgedGeocoder, NominatimBackend, OneMapBackend
+from negative_cache import NegativeCache
+from offline_geocoder import load_offline_geocoder
+from onemap import onemap_client
+from upstream import nominatim_gateway
+
+
+# one geocoder client and one cache shared by every session of the app; NOMINATIM_DOMAIN and
+# NOMINATIM_SCHEME point the client at another server such as a local stub
+geolocator = Nominatim(user_agent="my_app", domain=os.environ.get("NOMINATIM_DOMAIN", "nominatim.openstreetmap.org"),
+					   scheme=os.environ.get("NOMINATIM_SCHEME", "https"))  # using open street map API
+geocode_cache = GeocodeCache(os.environ.get("GEOCODE_CACHE_PATH", "geocode_cache.sqlite3"))
+offline_geocoder = load_offline_geocoder(os.environ.get("OFFLINE_GEOCODER_INDEX", "sg_address_index.pickle"))
+# Nominatim first, OneMap search as well when Nominatim is slower than its usual p95
+hedged_geocoder = HedgedGeocoder(NominatimBackend(geolocator, nominatim_gateway), [OneMapBackend(onemap_client)])
+# addresses no geocoder could place in Singapore, so typos are not looked up again on every rerun
+negative_cache = NegativeCache()
+
+
+class AddressNotFound(Exception):
+	pass
+
+
+def convert_address(address):
+	# addresses in the local postal code / street index never leave the process
+	point = offline_geocoder.geocode(address)
+	if point is not None:
+		return point
+	# repeat addresses are served from the on-disk cache without calling Nominatim
+	point = geocode_cache.get(address)
+	if point is not None:
+		return point
+	if address in negative_cache:
+		raise AddressNotFound(address)
+	# using Nominatin from Geopy (hedged with OneMap) to convert address to latitude and longitude
+	# coordinates; the gateways rate-limit the calls and merge concurrent lookups of the same address
+	point = hedged_geocoder.geocode(address, normalise_address(address))
+	if point is None:
+		# only definite misses are remembered, upstream failures raise UpstreamError above
+		negative_cache.add(address)
+		raise AddressNotFound(address)
+	geocode_cache.put(address, point)
+	return point
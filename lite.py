@@ -0,0 +1,48 @@
+# Lite mode: the centres page as plain ranked text, for slow connections and metered data.
+#
+# No map, no hero image and no widgets beyond the search inputs: the nearest centres with their
+# vaccine type, address, straight-line distance and a directions link. The app switches to it
+# with ?lite=1 in the URL, or by itself when the browser reports a 2G connection or data saver
+# (?lite=0 always gives the full page). Without the compiled centre coordinates there are no
+# distances, and every matching centre is listed with its address and directions link instead.
+#
+# The results have to stay within LITE_PAYLOAD_BUDGET, tests/test_lite.py checks the worst case
+# (every centre type, every region) against it, with and without distances.
+
+LITE_RESULTS = 10
+LITE_PAYLOAD_BUDGET = 20 * 1024  # bytes
+SLOW_CONNECTIONS = ("slow-2g", "2g")
+
+
+def is_slow_connection(info):
+	# info: what the browser reported through the connection probe, None when not known yet
+	if not info:
+		return False
+	return bool(info.get("save_data")) or info.get("effective_type") in SLOW_CONNECTIONS
+
+
+def directions_link(address_text, vc):
+	return "https://www.google.com/maps/dir/" + address_text.replace(" ", "+") + "/" + vc.replace(" ", "+")
+
+
+def lite_results(registry, origin, address_text, vaccine_types=None, regions=None, n=LITE_RESULTS):
+	# markdown list of the n nearest centres, or of every matching centre when their
+	# coordinates are not known
+	nearest = registry.nearest(origin, n, vaccine_types, regions)
+	if nearest:
+		return "\n".join("%d. %s - %skm - [directions](<%s>)" % (
+			rank, _centre_text(registry, name), km, directions_link(address_text, name)) for rank, (name, km) in enumerate(nearest, 1))
+	names = registry.query(vaccine_types, regions)
+	if not names:
+		return "There is no vaccination centre for the selected vaccine types and regions."
+	lines = ["Distances are not available right now, these are all the centres for the selected vaccine types and regions:", ""]
+	lines.extend("- %s - [directions](<%s>)" % (_centre_text(registry, name), directions_link(address_text, name)) for name in names)
+	return "\n".join(lines)
+
+
+def _centre_text(registry, name):
+	return "**%s** (%s), %s" % (name, registry.vaccine_type_of(name), registry.addresses[registry.index_of(name)])
+
+
+def payload_size(text):
+	return len(text.encode("utf-8"))
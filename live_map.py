@@ -0,0 +1,41 @@
+import html
+import os
+
+import streamlit.components.v1 as components
+
+from map_assets import LIVE_MAP_CSS, LIVE_MAP_JS, asset_url, map_tiles
+from maps import CENTRE_ZOOM, MAP_HEIGHT, centre_marker_rows
+
+
+# Streamlit component around map_component/, a Leaflet map that is created once per session
+# and updated in place. On each rerun it receives only the small JSON state built below (a few
+# hundred bytes, plus the centre layer when every centre is shown) instead of a whole new
+# folium HTML document, and redraws just the layers whose state changed.
+
+COMPONENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "map_component")
+
+_live_map = components.declare_component("live_map", path=COMPONENT_PATH)
+
+
+def _point(point, digits=6):
+	# ~0.1 m is plenty on screen and keeps long walking routes short
+	return [round(float(point[0]), digits), round(float(point[1]), digits)]
+
+
+def live_map_state(registry, vc, centre_point, origin, route_points, centre_distance, all_centres=False):
+	return {
+		# Leaflet is loaded from here rather than from index.html, so it can come from the vendored copies
+		"assets": {"css": [asset_url(url) for url in LIVE_MAP_CSS], "js": [asset_url(url) for url in LIVE_MAP_JS]},
+		"tiles": map_tiles(),
+		"zoom": CENTRE_ZOOM,
+		"height": MAP_HEIGHT,
+		"centres": centre_marker_rows(registry) if all_centres else None,
+		"centre": {"point": _point(centre_point), "popup": html.escape(vc.upper())},
+		"home": {"point": _point(origin), "popup": "Your Address"},
+		"route": {"points": [_point(point) for point in route_points], "popup": str(centre_distance) + "km"},
+	}
+
+
+def live_map(state, key="live_map"):
+	# the fixed key keeps the same iframe (and Leaflet instance) across reruns
+	return _live_map(state=state, key=key, default=None)
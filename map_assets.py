@@ -0,0 +1,74 @@
+import os
+from urllib.parse import urlsplit
+
+import folium
+from folium.plugins import FastMarkerCluster
+
+from mbtiles import MAX_ZOOM
+
+
+# Where the maps load Leaflet and friends from, and where their tiles come from.
+#
+# By default both come from the public CDNs and OpenStreetMap, as folium does. With
+# MAP_ASSETS_URL and MAP_TILES_URL set (see tile_server.py), every map load stays on our own
+# infrastructure instead: the JS/CSS files are the vendored copies written by
+#     python seed_map_cache.py assets
+# under a path that mirrors the CDN URL, so the relative font and image URLs inside the CSS
+# files keep working, and the tiles come from the MBTiles file written by
+#     python seed_map_cache.py tiles
+
+ASSETS_URL = os.environ.get("MAP_ASSETS_URL")  # e.g. http://localhost:8600/static
+TILES_URL = os.environ.get("MAP_TILES_URL")  # e.g. http://localhost:8600/tiles/{z}/{x}/{y}.png
+ASSETS_DIR = "map_assets"
+
+OSM_ATTRIBUTION = '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
+OSM_TILES_URL = "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
+
+# loaded by the live map component (map_component/live_map.js)
+LIVE_MAP_CSS = [
+	"https://cdn.jsdelivr.net/npm/leaflet@1.6.0/dist/leaflet.css",
+	"https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/MarkerCluster.css",
+	"https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/MarkerCluster.Default.css",
+]
+LIVE_MAP_JS = [
+	"https://cdn.jsdelivr.net/npm/leaflet@1.6.0/dist/leaflet.js",
+	"https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/leaflet.markercluster.js",
+]
+
+
+def cdn_urls():
+	# every JS/CSS file the maps of this app load from a CDN
+	urls = []
+	for element in (folium.Map, FastMarkerCluster):
+		urls.extend(url for _, url in element.default_js + element.default_css)
+	urls.extend(LIVE_MAP_CSS + LIVE_MAP_JS)
+	return list(dict.fromkeys(urls))
+
+
+def local_path(url):
+	# https://cdn.jsdelivr.net/npm/leaflet@1.6.0/dist/leaflet.js -> cdn.jsdelivr.net/npm/leaflet@1.6.0/dist/leaflet.js
+	parts = urlsplit(url)
+	return parts.netloc + parts.path
+
+
+def asset_url(url):
+	if not ASSETS_URL:
+		return url
+	return ASSETS_URL.rstrip("/") + "/" + local_path(url)
+
+
+def localise_html(html):
+	# point the CDN links in a rendered folium document at the vendored copies
+	if not ASSETS_URL:
+		return html
+	for host in sorted({urlsplit(url).netloc for url in cdn_urls()}):
+		html = html.replace("https://" + host + "/", ASSETS_URL.rstrip("/") + "/" + host + "/")
+	return html
+
+
+def map_tiles():
+	# tile layer options shared by the folium maps and the live map
+	if TILES_URL:
+		# the local tile set stops at MAX_ZOOM, closer zoom levels scale up its tiles
+		return {"url": TILES_URL, "attribution": OSM_ATTRIBUTION, "max_zoom": 18, "max_native_zoom": MAX_ZOOM}
+	return {"url": OSM_TILES_URL, "attribution": OSM_ATTRIBUTION, "max_zoom": 18, "max_native_zoom": 18}
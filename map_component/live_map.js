@@ -0,0 +1,116 @@
+// Leaflet map that stays alive across Streamlit reruns.
+//
+// Streamlit keeps this iframe as long as the component's key does not change and sends the
+// new state on every rerun. Each part of the state (all centres, selected centre, home, route)
+// is compared with what is already drawn and only the layers that changed are replaced, so
+// Leaflet, its CSS and the tiles on screen are loaded once.
+(function () {
+	var map = null;
+	var layers = {};
+	var drawn = {};
+
+	function send(type, data) {
+		var message = {isStreamlitMessage: true, type: type};
+		for (var name in data) {
+			message[name] = data[name];
+		}
+		window.parent.postMessage(message, "*");
+	}
+
+	function changed(name, value) {
+		var json = JSON.stringify(value === undefined ? null : value);
+		if (drawn[name] === json) {
+			return false;
+		}
+		drawn[name] = json;
+		return true;
+	}
+
+	function replace(name, layer) {
+		if (layers[name]) {
+			map.removeLayer(layers[name]);
+		}
+		layers[name] = layer;
+		if (layer) {
+			layer.addTo(map);
+		}
+	}
+
+	// rows are [lat, lon, colour, popup html], as built by maps.centre_marker_rows
+	function centresLayer(rows) {
+		var cluster = L.markerClusterGroup();
+		rows.forEach(function (row) {
+			L.circleMarker([row[0], row[1]], {radius: 7, color: row[2], fillColor: row[2], fillOpacity: 0.8, weight: 1})
+				.bindPopup(row[3]).addTo(cluster);
+		});
+		return cluster;
+	}
+
+	// Leaflet and its plugins, from the CDN or our own asset server; scripts load in order
+	function loadAssets(assets, done) {
+		assets.css.forEach(function (url) {
+			var link = document.createElement("link");
+			link.rel = "stylesheet";
+			link.href = url;
+			document.head.appendChild(link);
+		});
+		(function next(i) {
+			if (i === assets.js.length) {
+				done();
+				return;
+			}
+			var script = document.createElement("script");
+			script.src = assets.js[i];
+			script.onload = function () { next(i + 1); };
+			document.head.appendChild(script);
+		})(0);
+	}
+
+	function render(state) {
+		if (map === null) {
+			map = L.map("map").setView(state.centre.point, state.zoom);
+			L.tileLayer(state.tiles.url, {attribution: state.tiles.attribution, maxZoom: state.tiles.max_zoom,
+				maxNativeZoom: state.tiles.max_native_zoom}).addTo(map);
+		}
+		if (changed("centres", state.centres)) {
+			replace("centres", state.centres ? centresLayer(state.centres) : null);
+		}
+		if (changed("centre", state.centre)) {
+			replace("centre", L.marker(state.centre.point).bindPopup(state.centre.popup));
+		}
+		if (changed("home", state.home)) {
+			replace("home", L.circleMarker(state.home.point, {radius: 9, color: "#333", weight: 3, fillColor: "#fff", fillOpacity: 1})
+				.bindPopup(state.home.popup));
+		}
+		if (changed("route", state.route)) {
+			replace("route", L.polyline(state.route.points).bindPopup(state.route.popup));
+		}
+		// only move the view when the centre or home moved, not when e.g. the centre layer toggles
+		if (changed("view", [state.centre.point, state.home.point])) {
+			map.fitBounds(layers.route.getBounds().extend(state.home.point).extend(state.centre.point), {padding: [30, 30]});
+		}
+	}
+
+	var loading = null;
+	var latest = null;
+
+	window.addEventListener("message", function (event) {
+		if (event.data.type !== "streamlit:render") {
+			return;
+		}
+		latest = event.data.args.state;
+		send("streamlit:setFrameHeight", {height: latest.height});
+		if (loading === null) {
+			// the first state decides where Leaflet comes from; states arriving meanwhile are
+			// not lost, the latest one is drawn once it has loaded
+			loading = true;
+			loadAssets(latest.assets, function () {
+				loading = false;
+				render(latest);
+			});
+		} else if (loading === false) {
+			render(latest);
+		}
+	});
+	send("streamlit:componentReady", {apiVersion: 1});
+})();
@@ -0,0 +1,174 @@
+import functools
+import html
+import json
+import threading
+from collections import OrderedDict
+
+import folium
+from folium.plugins import FastMarkerCluster
+
+from centres import SG_LAT_RANGE, SG_LON_RANGE
+from map_assets import TILES_URL, localise_html, map_tiles
+
+
+# Folium maps of the vaccination centres.
+#
+# The "selected centre" map shows the chosen centre, the user's home and the route between
+# them. The "all centres" map adds every centre as one clustered layer, coloured by vaccine
+# type. That layer is the same for every user: its marker data is computed once per registry
+# and is drawn by a single FastMarkerCluster script, so it costs a few KB of JSON instead of
+# one Marker object (and one block of generated JS) per centre. Per request, only the
+# highlighted centre, the home marker and the route are added on top.
+#
+# MapRenderCache keeps the rendered HTML of those base maps, built on first use and shared by
+# every session: the map around a centre with its marker, and the overview. A request copies
+# the cached HTML and splices in its own overlays as one short script, instead of rebuilding
+# and re-serialising the whole folium object graph on every rerun
+# (python benchmark_maps.py compares the two).
+
+SINGAPORE_CENTRE = [(SG_LAT_RANGE[0] + SG_LAT_RANGE[1]) / 2, (SG_LON_RANGE[0] + SG_LON_RANGE[1]) / 2]
+CENTRE_ZOOM = 12
+OVERVIEW_ZOOM = 11
+MAP_WIDTH = 700
+MAP_HEIGHT = 500
+MAX_RENDERED_MAPS = 256
+
+# one colour per vaccine type, in the order of registry.vaccine_types
+VACCINE_COLOURS = ["#2a81cb", "#cb2b3e", "#2aad27", "#cb8427", "#9c2bcb", "#7b7b7b"]
+
+# rows are [lat, lon, colour, popup html]
+CENTRE_MARKER_CALLBACK = """function (row) {
+	var marker = L.circleMarker(new L.LatLng(row[0], row[1]),
+		{radius: 7, color: row[2], fillColor: row[2], fillOpacity: 0.8, weight: 1});
+	marker.bindPopup(row[3]);
+	return marker;
+}"""
+
+
+def vaccine_colour(registry, vaccine_type):
+	return VACCINE_COLOURS[registry.vaccine_types.index(vaccine_type) % len(VACCINE_COLOURS)]
+
+
+@functools.lru_cache(maxsize=1)
+def centre_marker_rows(registry):
+	rows = []
+	for i, name in enumerate(registry.names):
+		if not registry.has_location(name):
+			continue
+		vaccine_type = registry.vaccine_type_of(name)
+		rows.append([float(registry.latitudes[i]), float(registry.longitudes[i]), vaccine_colour(registry, vaccine_type),
+					 html.escape(name + " (" + vaccine_type + ")")])
+	return rows
+
+
+def add_centre_marker(m, vc, centre_point):
+	folium.Marker(centre_point, popup=vc.upper()).add_to(m)
+
+
+def add_overlays(m, origin, route_points, centre_distance):
+	# the parts of the map that differ per user
+	folium.Marker(origin, popup="Your Address", icon=folium.Icon(icon="home")).add_to(m)
+	folium.PolyLine(route_points, popup=str(centre_distance) + "km").add_to(m)
+
+
+def new_map(location, zoom_start):
+	if not TILES_URL:
+		return folium.Map(location=location, zoom_start=zoom_start)
+	tiles = map_tiles()
+	m = folium.Map(location=location, zoom_start=zoom_start, tiles=None)
+	folium.TileLayer(tiles["url"], attr=tiles["attribution"], max_zoom=tiles["max_zoom"],
+					 max_native_zoom=tiles["max_native_zoom"]).add_to(m)
+	return m
+
+
+def centre_base_map(vc, centre_point):
+	m = new_map(centre_point, CENTRE_ZOOM)
+	add_centre_marker(m, vc, centre_point)
+	return m
+
+
+def overview_base_map(registry):
+	m = new_map(SINGAPORE_CENTRE, OVERVIEW_ZOOM)
+	FastMarkerCluster(centre_marker_rows(registry), callback=CENTRE_MARKER_CALLBACK,
+					  name="Vaccination centres").add_to(m)
+	return m
+
+
+def centre_map(vc, centre_point, origin, route_points, centre_distance):
+	m = centre_base_map(vc, centre_point)
+	add_overlays(m, origin, route_points, centre_distance)
+	return m
+
+
+def all_centres_map(registry, vc, centre_point, origin, route_points, centre_distance):
+	m = overview_base_map(registry)
+	add_centre_marker(m, vc, centre_point)
+	add_overlays(m, origin, route_points, centre_distance)
+	m.fit_bounds([origin, centre_point] + list(route_points))
+	return m
+
+
+def render_html(m):
+	return localise_html(folium.Figure().add_child(m).render())
+
+
+def _point(point):
+	return [float(point[0]), float(point[1])]
+
+
+def overlay_script(map_name, origin, route_points, centre_distance, vc=None, centre_point=None):
+	# the Leaflet equivalent of add_overlays (and add_centre_marker plus fit_bounds on the overview)
+	lines = [
+		"var home = L.marker(%s, {icon: L.AwesomeMarkers.icon("
+		"{icon: 'home', iconColor: 'white', markerColor: 'blue', prefix: 'glyphicon'})});" % json.dumps(_point(origin)),
+		"home.bindPopup('Your Address').addTo(%s);" % map_name,
+		"var route = L.polyline(%s);" % json.dumps([_point(point) for point in route_points]),
+		"route.bindPopup(%s).addTo(%s);" % (json.dumps(str(centre_distance) + "km"), map_name),
+	]
+	if vc is not None:
+		lines.append("L.marker(%s).bindPopup(%s).addTo(%s);" % (
+			json.dumps(_point(centre_point)), json.dumps(html.escape(vc.upper())), map_name))
+		lines.append("%s.fitBounds(route.getBounds().extend(home.getLatLng()));" % map_name)
+	return "(function () {\n" + "\n".join(lines) + "\n})();"
+
+
+class MapRenderCache:
+
+	def __init__(self, max_entries=MAX_RENDERED_MAPS):
+		self.max_entries = max_entries
+		self.hits = 0
+		self.misses = 0
+		self._maps = OrderedDict()  # key -> (html, name of the Leaflet map variable)
+		self._lock = threading.Lock()
+
+	def base(self, key, build):
+		with self._lock:
+			entry = self._maps.get(key)
+			if entry is not None:
+				self._maps.move_to_end(key)
+				self.hits += 1
+				return entry
+			self.misses += 1
+		# built outside the lock, two sessions racing for the same new key both build it once
+		m = build()
+		entry = (render_html(m), m.get_name())
+		with self._lock:
+			self._maps[key] = entry
+			while len(self._maps) > self.max_entries:
+				self._maps.popitem(last=False)
+		return entry
+
+	def render(self, registry, vc, centre_point, origin, route_points, centre_distance, all_centres=False):
+		# full HTML document of the map for one request
+		if all_centres:
+			base_html, map_name = self.base(("all centres", id(registry)), lambda: overview_base_map(registry))
+			overlay = overlay_script(map_name, origin, route_points, centre_distance, vc, centre_point)
+		else:
+			key = ("centre", vc, tuple(_point(centre_point)))
+			base_html, map_name = self.base(key, lambda: centre_base_map(vc, centre_point))
+			overlay = overlay_script(map_name, origin, route_points, centre_distance)
+		head, end, tail = base_html.rpartition("</html>")
+		return head + "<script>\n" + overlay + "\n</script>\n" + end + tail
+
+
+map_cache = MapRenderCache()
@@ -0,0 +1,95 @@
+import math
+import sqlite3
+import threading
+
+from centres import SG_LAT_RANGE, SG_LON_RANGE
+
+
+# Map tiles stored in an MBTiles file (a SQLite database, https://github.com/mapbox/mbtiles-spec).
+#
+# seed_map_cache.py fills it with the Singapore tiles at the zoom levels the app uses,
+# tile_server.py serves them to the maps and static_map.py draws map images from them.
+# MBTiles numbers rows from the bottom (TMS), the methods below take the usual XYZ rows
+# of web maps and flip them.
+
+MBTILES_PATH = "singapore.mbtiles"
+MIN_ZOOM = 10
+MAX_ZOOM = 16
+TILE_SIZE = 256
+
+
+def tile_xy(lat, lon, zoom):
+	# fractional XYZ tile coordinates of a point, web mercator
+	n = 2 ** zoom
+	x = (lon + 180.0) / 360.0 * n
+	lat_radians = math.radians(lat)
+	y = (1.0 - math.asinh(math.tan(lat_radians)) / math.pi) / 2.0 * n
+	return x, y
+
+
+def tiles_in_bbox(lat_range, lon_range, zoom):
+	x0, y0 = tile_xy(lat_range[1], lon_range[0], zoom)
+	x1, y1 = tile_xy(lat_range[0], lon_range[1], zoom)
+	for x in range(int(x0), int(x1) + 1):
+		for y in range(int(y0), int(y1) + 1):
+			yield zoom, x, y
+
+
+def singapore_tiles(min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM):
+	for zoom in range(min_zoom, max_zoom + 1):
+		yield from tiles_in_bbox(SG_LAT_RANGE, SG_LON_RANGE, zoom)
+
+
+class MBTiles:
+
+	def __init__(self, path=MBTILES_PATH, writable=False):
+		self.path = path
+		self.writable = writable
+		self._local = threading.local()
+		if writable:
+			self._connect().executescript(
+				"CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);"
+				"CREATE TABLE IF NOT EXISTS tiles ("
+				" zoom_level INTEGER NOT NULL,"
+				" tile_column INTEGER NOT NULL,"
+				" tile_row INTEGER NOT NULL,"
+				" tile_data BLOB NOT NULL);"
+				"CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles (zoom_level, tile_column, tile_row);"
+			)
+
+	def _connect(self):
+		# one connection per thread, the tile server answers requests on many threads
+		connection = getattr(self._local, "connection", None)
+		if connection is None:
+			if self.writable:
+				connection = sqlite3.connect(self.path)
+			else:
+				connection = sqlite3.connect("file:" + self.path + "?mode=ro", uri=True)
+			self._local.connection = connection
+		return connection
+
+	def get(self, zoom, x, y):
+		row = self._connect().execute(
+			"SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+			(zoom, x, 2 ** zoom - 1 - y)).fetchone()
+		return row[0] if row is not None else None
+
+	def __contains__(self, tile):
+		zoom, x, y = tile
+		return self._connect().execute(
+			"SELECT 1 FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+			(zoom, x, 2 ** zoom - 1 - y)).fetchone() is not None
+
+	def put(self, zoom, x, y, data):
+		with self._connect() as connection:
+			connection.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", (zoom, x, 2 ** zoom - 1 - y, data))
+
+	def metadata(self):
+		return dict(self._connect().execute("SELECT name, value FROM metadata").fetchall())
+
+	def set_metadata(self, **values):
+		with self._connect() as connection:
+			connection.executemany("INSERT OR REPLACE INTO metadata VALUES (?, ?)", [(k, str(v)) for k, v in values.items()])
+
+	def __len__(self):
+		return self._connect().execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
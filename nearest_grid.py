@@ -0,0 +1,158 @@
+import json
+import math
+import os
+import sys
+import threading
+
+import numpy as np
+
+from centres import SG_LAT_RANGE, SG_LON_RANGE
+
+
+# Precomputed nearest-centre lookup grid for Singapore.
+#
+# `python nearest_grid.py build [nearest_grid] [cell metres]` covers Singapore's bounding
+# box with square cells (100 m by default) and stores, for every cell centre and every
+# vaccine type (plus one layer for any vaccine type), the registry row of the nearest
+# centre and its distance in metres:
+#     nearest_grid/rows.npy    int16  [layer, row, column]
+#     nearest_grid/metres.npy  uint16 [layer, row, column]
+#     nearest_grid/meta.json   grid origin, cell size, layers and the centres it was built for
+# At request time a coordinate maps to its cell with two multiplications, so the nearest
+# centre is a constant-time array read from the memory-mapped files.
+
+NEAREST_GRID_DIR = os.environ.get("NEAREST_GRID_DIR", "nearest_grid")
+CELL_METRES = 100
+ANY_VACCINE = "Any"
+
+METRES_PER_DEGREE = 111320
+CHUNK_CELLS = 20000
+
+
+class NearestGrid:
+
+	def __init__(self, meta, rows, metres):
+		self.lat0 = meta["lat0"]
+		self.lon0 = meta["lon0"]
+		self.dlat = meta["dlat"]
+		self.dlon = meta["dlon"]
+		self.shape = tuple(meta["shape"])
+		self.layers = {name: i for i, name in enumerate(meta["layers"])}
+		self.centre_names = meta["centre_names"]
+		self.centre_points = meta["centre_points"]
+		self.rows = rows
+		self.metres = metres
+
+	@classmethod
+	def load(cls, directory=NEAREST_GRID_DIR):
+		with open(os.path.join(directory, "meta.json")) as f:
+			meta = json.load(f)
+		rows = np.load(os.path.join(directory, "rows.npy"), mmap_mode="r")
+		metres = np.load(os.path.join(directory, "metres.npy"), mmap_mode="r")
+		return cls(meta, rows, metres)
+
+	def cell(self, origin):
+		i = int((float(origin[0]) - self.lat0) / self.dlat)
+		j = int((float(origin[1]) - self.lon0) / self.dlon)
+		if 0 <= i < self.shape[0] and 0 <= j < self.shape[1]:
+			return i, j
+		return None
+
+	def lookup(self, origin, vaccine_type=ANY_VACCINE):
+		# (registry row, km) of the nearest centre, or None outside the grid / for unknown types
+		layer = self.layers.get(vaccine_type)
+		cell = self.cell(origin)
+		if layer is None or cell is None:
+			return None
+		row = int(self.rows[layer, cell[0], cell[1]])
+		if row < 0:
+			return None
+		return row, int(self.metres[layer, cell[0], cell[1]]) / 1000
+
+
+def build_grid(registry, cell_metres=CELL_METRES):
+	lat0, lat1 = SG_LAT_RANGE
+	lon0, lon1 = SG_LON_RANGE
+	dlat = cell_metres / METRES_PER_DEGREE
+	dlon = cell_metres / (METRES_PER_DEGREE * math.cos(math.radians((lat0 + lat1) / 2)))
+	shape = (int(math.ceil((lat1 - lat0) / dlat)), int(math.ceil((lon1 - lon0) / dlon)))
+
+	cell_lats = lat0 + (np.arange(shape[0]) + 0.5) * dlat
+	cell_lons = lon0 + (np.arange(shape[1]) + 0.5) * dlon
+	centres = np.column_stack([np.repeat(cell_lats, shape[1]), np.tile(cell_lons, shape[0])])
+
+	layers = list(registry.vaccine_types) + [ANY_VACCINE]
+	rows = np.full((len(layers), shape[0] * shape[1]), -1, dtype=np.int16)
+	metres = np.full((len(layers), shape[0] * shape[1]), np.iinfo(np.uint16).max, dtype=np.uint16)
+	# registry rows with known coordinates that each layer chooses from
+	known = ~np.isnan(registry.latitudes)
+	layer_columns = [np.flatnonzero(known & (registry.vaccine_codes == code)) for code in range(len(registry.vaccine_types))]
+	layer_columns.append(np.flatnonzero(known))
+
+	for start in range(0, len(centres), CHUNK_CELLS):
+		block = registry.distance_matrix(centres[start:start + CHUNK_CELLS])
+		for layer, columns in enumerate(layer_columns):
+			if not len(columns):
+				continue
+			sub = block[:, columns]
+			best = np.argmin(sub, axis=1)
+			rows[layer, start:start + len(block)] = columns[best]
+			km = sub[np.arange(len(block)), best]
+			metres[layer, start:start + len(block)] = np.minimum(np.rint(km * 1000), np.iinfo(np.uint16).max)
+
+	meta = {
+		"lat0": lat0,
+		"lon0": lon0,
+		"dlat": dlat,
+		"dlon": dlon,
+		"shape": list(shape),
+		"layers": layers,
+		"centre_names": list(registry.names),
+		"centre_points": _centre_points(registry),
+	}
+	return NearestGrid(meta, rows.reshape((len(layers),) + shape), metres.reshape((len(layers),) + shape)), meta
+
+
+def _centre_points(registry):
+	# rounded coordinates the grid was built for, NaN (unknown) written as None
+	return [[None if math.isnan(lat) else round(lat, 6), None if math.isnan(lon) else round(lon, 6)]
+			for lat, lon in zip(registry.latitudes.tolist(), registry.longitudes.tolist())]
+
+
+def save_grid(grid, meta, directory=NEAREST_GRID_DIR):
+	os.makedirs(directory, exist_ok=True)
+	np.save(os.path.join(directory, "rows.npy"), np.ascontiguousarray(grid.rows))
+	np.save(os.path.join(directory, "metres.npy"), np.ascontiguousarray(grid.metres))
+	with open(os.path.join(directory, "meta.json"), "w") as f:
+		json.dump(meta, f)
+
+
+_grid = None
+_grid_loaded = False
+_grid_lock = threading.Lock()
+
+
+def get_nearest_grid(registry, directory=NEAREST_GRID_DIR):
+	# memory-mapped once per process; None when the grid is missing or was built for other centres
+	global _grid, _grid_loaded
+	with _grid_lock:
+		if not _grid_loaded:
+			if os.path.exists(os.path.join(directory, "meta.json")):
+				grid = NearestGrid.load(directory)
+				if grid.centre_names == list(registry.names) and grid.centre_points == _centre_points(registry):
+					_grid = grid
+			_grid_loaded = True
+		return _grid
+
+
+if __name__ == '__main__':
+	from centres import get_registry
+
+	if len(sys.argv) < 2 or sys.argv[1] != "build" or len(sys.argv) > 4:
+		sys.exit("usage: python nearest_grid.py build [output directory] [cell metres]")
+	directory = sys.argv[2] if len(sys.argv) > 2 else NEAREST_GRID_DIR
+	cell_metres = float(sys.argv[3]) if len(sys.argv) > 3 else CELL_METRES
+	grid, meta = build_grid(get_registry(), cell_metres)
+	save_grid(grid, meta, directory)
+	print("Built a %d x %d grid of %gm cells for %d vaccine type layers into %s"
+		  % (grid.shape[0], grid.shape[1], cell_metres, len(grid.layers), directory))
@@ -0,0 +1,103 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from geocode_cache import normalise_address
+
+
+# Negative cache for addresses that did not resolve (or resolved outside Singapore).
+#
+# Recent failures are kept exactly in a small LRU. Older ones live on in a Bloom filter,
+# which holds far more entries in a few hundred KB at the cost of a tiny false-positive
+# rate. Bloom filters cannot forget single entries, so there are two of them: new entries go
+# into the current one, lookups check both, and every ttl / 2 the older one is dropped and
+# replaced by an empty filter. Every entry therefore expires after ttl / 2 to ttl and the
+# address is tried upstream again.
+
+TTL = 6 * 60 * 60
+CAPACITY = 100000  # per Bloom filter generation
+FALSE_POSITIVE_RATE = 1e-4
+LRU_SIZE = 1024
+
+
+class BloomFilter:
+
+	def __init__(self, capacity=CAPACITY, false_positive_rate=FALSE_POSITIVE_RATE):
+		bits = int(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+		self.size = max(8, bits)
+		self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+		self.bits = bytearray((self.size + 7) // 8)
+
+	def _positions(self, key):
+		# double hashing: position_i = h1 + i * h2
+		digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+		h1 = int.from_bytes(digest[:8], "little")
+		h2 = int.from_bytes(digest[8:], "little") | 1
+		return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+	def add(self, key):
+		for position in self._positions(key):
+			self.bits[position >> 3] |= 1 << (position & 7)
+
+	def __contains__(self, key):
+		return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class NegativeCache:
+
+	def __init__(self, ttl=TTL, capacity=CAPACITY, false_positive_rate=FALSE_POSITIVE_RATE, lru_size=LRU_SIZE):
+		self.ttl = ttl
+		self.capacity = capacity
+		self.false_positive_rate = false_positive_rate
+		self.lru_size = lru_size
+		self.hits = 0
+		self.misses = 0
+		self._recent = OrderedDict()  # normalised address -> expiry time
+		self._current = BloomFilter(capacity, false_positive_rate)
+		self._previous = BloomFilter(capacity, false_positive_rate)
+		self._rotated_at = time.monotonic()
+		self._lock = threading.Lock()
+
+	def _rotate(self, now):
+		# rotations happen on a fixed ttl / 2 schedule, so a filter never holds an entry for
+		# longer than ttl and always forgets it before its exact LRU entry expires
+		steps = int((now - self._rotated_at) // (self.ttl / 2))
+		if steps >= 1:
+			self._previous = self._current if steps == 1 else BloomFilter(self.capacity, self.false_positive_rate)
+			self._current = BloomFilter(self.capacity, self.false_positive_rate)
+			self._rotated_at += steps * self.ttl / 2
+
+	def add(self, address):
+		key = normalise_address(address)
+		now = time.monotonic()
+		with self._lock:
+			self._rotate(now)
+			self._current.add(key)
+			self._recent[key] = now + self.ttl
+			self._recent.move_to_end(key)
+			while len(self._recent) > self.lru_size:
+				self._recent.popitem(last=False)
+
+	def __contains__(self, address):
+		key = normalise_address(address)
+		now = time.monotonic()
+		with self._lock:
+			self._rotate(now)
+			expires = self._recent.get(key)
+			if expires is not None:
+				if expires > now:
+					self._recent.move_to_end(key)
+					self.hits += 1
+					return True
+				del self._recent[key]
+			elif key in self._current or key in self._previous:
+				self.hits += 1
+				return True
+			self.misses += 1
+			return False
+
+	def stats(self):
+		with self._lock:
+			return {"recent": len(self._recent), "hits": self.hits, "misses": self.misses}
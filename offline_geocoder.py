@@ -0,0 +1,151 @@
+import csv
+import os
+import pickle
+import re
+import sys
+
+
+# Offline geocoder for Singapore addresses.
+#
+# The index is built once from a local address dataset (for example an SLA / OneMap
+# address point export) with one row per building and the columns
+# POSTAL, BLK_NO, ROAD_NAME, LATITUDE, LONGITUDE. Lookups go through two hash tables:
+# the 6-digit postal code, and the normalised (block, street) pair, so an address
+# resolves with a couple of dict lookups and no network access.
+#
+# Build the index with:
+#     python offline_geocoder.py build addresses.csv sg_address_index.pickle
+
+INDEX_VERSION = 1
+
+POSTAL_RE = re.compile(r"(?<!\d)(\d{6})(?!\d)")
+BLOCK_RE = re.compile(r"^(?:blk|block)?\s*(\d+[a-z]?)\s+(.+)$")
+
+# spell common street words the same way on both the dataset and the query side
+STREET_WORDS = {
+	"avenue": "ave",
+	"boulevard": "blvd",
+	"central": "ctrl",
+	"close": "cl",
+	"crescent": "cres",
+	"drive": "dr",
+	"garden": "gdn",
+	"gardens": "gdns",
+	"heights": "hts",
+	"lane": "ln",
+	"link": "lk",
+	"north": "nth",
+	"place": "pl",
+	"road": "rd",
+	"south": "sth",
+	"street": "st",
+	"terrace": "ter",
+	"upper": "upp",
+}
+
+
+def normalise_street(street):
+	words = re.sub(r"[^\w ]", " ", str(street).lower()).split()
+	# drop a trailing "singapore" and anything after it, e.g. "punggol field singapore 820108"
+	if "singapore" in words:
+		words = words[:words.index("singapore")]
+	return " ".join(STREET_WORDS.get(word, word) for word in words)
+
+
+def normalise_block(block):
+	return str(block).strip().lower().lstrip("0")
+
+
+def parse_postal(address):
+	match = POSTAL_RE.search(str(address))
+	return int(match.group(1)) if match else None
+
+
+def parse_block_street(address):
+	# "108 Punggol Field" / "Blk 108 Punggol Field, Singapore" -> ("108", "punggol field")
+	first_part = str(address).lower().split(",")[0].strip()
+	match = BLOCK_RE.match(first_part)
+	if not match:
+		return None
+	street = normalise_street(match.group(2))
+	if not street:
+		return None
+	return normalise_block(match.group(1)), street
+
+
+class OfflineGeocoder:
+
+	def __init__(self, postal_index=None, street_index=None):
+		# postal_index: {postal code: (lat, lon)}
+		# street_index: {(block, street): (lat, lon)}
+		self.postal_index = postal_index or {}
+		self.street_index = street_index or {}
+
+	def __len__(self):
+		return len(self.postal_index)
+
+	@classmethod
+	def from_rows(cls, rows):
+		postal_index = {}
+		street_index = {}
+		for row in rows:
+			try:
+				point = (float(row["LATITUDE"]), float(row["LONGITUDE"]))
+			except (KeyError, TypeError, ValueError):
+				continue
+			postal = parse_postal(row.get("POSTAL", ""))
+			if postal is not None:
+				postal_index.setdefault(postal, point)
+			block = normalise_block(row.get("BLK_NO", ""))
+			street = normalise_street(row.get("ROAD_NAME", ""))
+			if block and street:
+				street_index.setdefault((block, street), point)
+		return cls(postal_index, street_index)
+
+	@classmethod
+	def from_csv(cls, path):
+		with open(path, newline="", encoding="utf-8-sig") as f:
+			return cls.from_rows(csv.DictReader(f))
+
+	@classmethod
+	def load(cls, path):
+		with open(path, "rb") as f:
+			data = pickle.load(f)
+		if data.get("version") != INDEX_VERSION:
+			raise ValueError("Unsupported offline geocoder index version in " + path)
+		return cls(data["postal"], data["street"])
+
+	def save(self, path):
+		with open(path, "wb") as f:
+			pickle.dump({"version": INDEX_VERSION, "postal": self.postal_index, "street": self.street_index},
+						f, protocol=pickle.HIGHEST_PROTOCOL)
+
+	def geocode(self, address):
+		# returns [lat, lon] like convert_address, or None when the address is not indexed
+		postal = parse_postal(address)
+		if postal is not None:
+			point = self.postal_index.get(postal)
+			if point is not None:
+				return list(point)
+		block_street = parse_block_street(address)
+		if block_street is not None:
+			point = self.street_index.get(block_street)
+			if point is not None:
+				return list(point)
+		return None
+
+
+def load_offline_geocoder(path):
+	# a missing index just means every lookup falls through to the online geocoder
+	if path and os.path.exists(path):
+		return OfflineGeocoder.load(path)
+	return OfflineGeocoder()
+
+
+if __name__ == '__main__':
+	if len(sys.argv) != 4 or sys.argv[1] != "build":
+		sys.exit("usage: python offline_geocoder.py build <addresses.csv> <index.pickle>")
+	geocoder = OfflineGeocoder.from_csv(sys.argv[2])
+	geocoder.save(sys.argv[3])
+	print("Indexed %d postal codes and %d block/street pairs into %s"
+		  % (len(geocoder.postal_index), len(geocoder.street_index), sys.argv[3]))
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tasks import io_pool
+from upstream import UpstreamBadResponse, UpstreamError, is_transient_http_error, onemap_gateway
+
+
+# OneMap search client shared by every session.
+#
+# Requests go through one pooled requests.Session with strict connect/read timeouts and the
+# rate-limited OneMap gateway in upstream.py.
+# Responses are cached per search value: fresh entries are returned directly, entries past
+# their TTL but within the stale window are returned immediately while the shared I/O pool
+# refreshes them, and if OneMap is unreachable a stale entry is served instead of an error.
+# Every failure reaches callers as an UpstreamError: an error status other than a transient
+# one, or a body that is not a JSON search result, is an UpstreamBadResponse and counts
+# against OneMap's circuit breaker.
+
+ONEMAP_SEARCH_URL = os.environ.get("ONEMAP_SEARCH_URL", 'https://developers.onemap.sg/commonapi/search')
+
+TIMEOUT = (3.05, 5)  # (connect, read) seconds
+TTL = 24 * 60 * 60
+STALE_TTL = 7 * 24 * 60 * 60
+MAX_ENTRIES = 1024
+
+
+class OneMapClient:
+
+	def __init__(self, url=ONEMAP_SEARCH_URL, ttl=TTL, stale_ttl=STALE_TTL, max_entries=MAX_ENTRIES,
+				 timeout=TIMEOUT, pool_size=16):
+		self.url = url
+		self.ttl = ttl
+		self.stale_ttl = stale_ttl
+		self.max_entries = max_entries
+		self.timeout = timeout
+		self.session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+		self.session.mount("https://", adapter)
+		self.session.mount("http://", adapter)
+		self._cache = OrderedDict()  # search value -> (data, fetched at)
+		self._refreshing = set()
+		self._lock = threading.Lock()
+
+	def _get(self, search_val):
+		params = {"searchVal": search_val, "returnGeom": "Y", "getAddrDetails": "Y"}
+		resp = self.session.get(self.url, params=params, timeout=self.timeout)
+		try:
+			resp.raise_for_status()
+		except requests.HTTPError as e:
+			if is_transient_http_error(e):
+				raise
+			raise UpstreamBadResponse("OneMap answered with an error: " + str(e)) from e
+		try:
+			data = json.loads(resp.content)
+		except ValueError as e:
+			raise UpstreamBadResponse("OneMap answered with something that is not JSON") from e
+		if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+			raise UpstreamBadResponse("OneMap answered without search results")
+		return data
+
+	def fetch(self, search_val, max_wait=None):
+		try:
+			return onemap_gateway.call(search_val, lambda: self._get(search_val), max_wait)
+		except requests.RequestException as e:
+			# requests errors the gateway does not retry, e.g. too many redirects
+			raise UpstreamBadResponse("OneMap request failed: " + str(e)) from e
+
+	def _cached(self, key):
+		with self._lock:
+			entry = self._cache.get(key)
+			if entry is not None:
+				self._cache.move_to_end(key)
+			return entry
+
+	def _store(self, key, data):
+		with self._lock:
+			self._cache[key] = (data, time.time())
+			self._cache.move_to_end(key)
+			while len(self._cache) > self.max_entries:
+				self._cache.popitem(last=False)
+
+	def _refresh(self, key, max_wait=None):
+		try:
+			self._store(key, self.fetch(key, max_wait))
+		except UpstreamError:
+			# keep serving the stale entry, the next request past the TTL tries again
+			pass
+		finally:
+			with self._lock:
+				self._refreshing.discard(key)
+
+	def _refresh_in_background(self, key, max_wait=None):
+		with self._lock:
+			if key in self._refreshing:
+				return
+			self._refreshing.add(key)
+		io_pool.submit(self._refresh, key, max_wait)
+
+	def prefetch(self, search_vals):
+		# warm the cache for search values that are missing or past their TTL. Prefetches only
+		# use spare rate limit (max_wait=0), so they never queue ahead of a lookup someone is
+		# waiting for; the ones that find no token are simply tried again on the next call.
+		for search_val in search_vals:
+			key = " ".join(str(search_val).split())
+			entry = self._cached(key)
+			if entry is None or time.time() - entry[1] > self.ttl:
+				self._refresh_in_background(key, max_wait=0)
+
+	def search(self, search_val):
+		key = " ".join(str(search_val).split())
+		entry = self._cached(key)
+		if entry is not None:
+			data, fetched_at = entry
+			age = time.time() - fetched_at
+			if age <= self.ttl:
+				return data
+			if age <= self.ttl + self.stale_ttl:
+				self._refresh_in_background(key)
+				return data
+		try:
+			data = self.fetch(key)
+		except UpstreamError:
+			if entry is not None:
+				# OneMap is down: an old answer beats no answer for centre locations
+				return entry[0]
+			raise
+		self._store(key, data)
+		return data
+
+	def clear(self):
+		with self._lock:
+			self._cache.clear()
+
+
+onemap_client = OneMapClient()
@@ -0,0 +1,105 @@
+import os
+import re
+import sys
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from centres import SG_LAT_RANGE, SG_LON_RANGE
+from map_assets import ASSETS_DIR, OSM_ATTRIBUTION, cdn_urls, local_path
+from mbtiles import MAX_ZOOM, MBTILES_PATH, MIN_ZOOM, MBTiles, singapore_tiles
+from upstream import UpstreamError, UpstreamGateway
+
+
+# Seeding tool for the offline map mode served by tile_server.py:
+#     python seed_map_cache.py tiles [singapore.mbtiles] [min zoom] [max zoom]
+#     python seed_map_cache.py assets [map_assets]
+#
+# "tiles" downloads every tile covering Singapore at the zoom levels the app uses (about 7,700
+# tiles for zoom 10 to 16) into an MBTiles file; tiles already in the file are skipped, so an
+# interrupted run can simply be started again. The tiles come from TILE_SOURCE_URL, which has
+# no default: OpenStreetMap's tile usage policy does not allow bulk downloads from its servers,
+# so it must be set to a tile provider that does, or to a tile server of your own, e.g.
+#     TILE_SOURCE_URL=https://tiles.example.com/{z}/{x}/{y}.png python seed_map_cache.py tiles
+#
+# "assets" downloads the Leaflet/folium JS and CSS files the maps use, plus the fonts and
+# images their CSS refers to, into a directory that mirrors the CDN URLs.
+
+TILE_SOURCE_URL = os.environ.get("TILE_SOURCE_URL")
+USER_AGENT = "choose_vaccines_sg map cache seeder"
+TIMEOUT = (3.05, 30)
+
+CSS_URL_RE = re.compile(r"url\(\s*['\"]?([^'\")]+)['\"]?\s*\)")
+
+USAGE = ("usage: TILE_SOURCE_URL=<url with {z}, {x} and {y}> python seed_map_cache.py tiles [singapore.mbtiles] [min zoom] [max zoom]\n"
+		 "       python seed_map_cache.py assets [" + ASSETS_DIR + "]")
+
+tile_gateway = UpstreamGateway("Tile source", rate=2.0, burst=2, max_wait=60.0)
+
+
+def _session():
+	session = requests.Session()
+	session.headers["User-Agent"] = USER_AGENT
+	return session
+
+
+def _get(session, url):
+	resp = session.get(url, timeout=TIMEOUT)
+	resp.raise_for_status()
+	return resp.content
+
+
+def seed_tiles(path=MBTILES_PATH, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM):
+	min_zoom, max_zoom = int(min_zoom), int(max_zoom)
+	store = MBTiles(path, writable=True)
+	store.set_metadata(name="Singapore", format="png", minzoom=min_zoom, maxzoom=max_zoom, attribution=OSM_ATTRIBUTION,
+					   bounds="%s,%s,%s,%s" % (SG_LON_RANGE[0], SG_LAT_RANGE[0], SG_LON_RANGE[1], SG_LAT_RANGE[1]))
+	session = _session()
+	fetched = skipped = failed = 0
+	for zoom, x, y in singapore_tiles(min_zoom, max_zoom):
+		if (zoom, x, y) in store:
+			skipped += 1
+			continue
+		url = TILE_SOURCE_URL.format(z=zoom, x=x, y=y)
+		try:
+			store.put(zoom, x, y, tile_gateway.call(url, lambda: _get(session, url)))
+			fetched += 1
+		except (requests.RequestException, UpstreamError) as e:
+			print("error: %d/%d/%d: %s" % (zoom, x, y, e), file=sys.stderr)
+			failed += 1
+	print("Seeded %s: %d tiles fetched, %d already there, %d failed" % (path, fetched, skipped, failed))
+	if failed:
+		sys.exit("Run the command again to retry the failed tiles")
+
+
+def vendor_assets(directory=ASSETS_DIR):
+	session = _session()
+	pending = cdn_urls()
+	seen = set(pending)
+	while pending:
+		url = pending.pop()
+		data = _get(session, url)
+		target = os.path.join(directory, local_path(url))
+		os.makedirs(os.path.dirname(target), exist_ok=True)
+		with open(target, "wb") as f:
+			f.write(data)
+		print(url + " -> " + target)
+		if urlsplit(url).path.endswith(".css"):
+			# fonts and images are loaded relative to the CSS file, so they go next to it
+			for reference in CSS_URL_RE.findall(data.decode("utf-8", "replace")):
+				if reference.startswith("data:"):
+					continue
+				parts = urlsplit(urljoin(url, reference))
+				dependency = parts.scheme + "://" + parts.netloc + parts.path
+				if dependency not in seen:
+					seen.add(dependency)
+					pending.append(dependency)
+
+
+if __name__ == '__main__':
+	if len(sys.argv) >= 2 and sys.argv[1] == "tiles" and len(sys.argv) <= 5 and TILE_SOURCE_URL:
+		seed_tiles(*sys.argv[2:5])
+	elif len(sys.argv) >= 2 and sys.argv[1] == "assets" and len(sys.argv) <= 3:
+		vendor_assets(*sys.argv[2:3])
+	else:
+		sys.exit(USAGE)
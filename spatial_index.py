@@ -0,0 +1,172 @@
+import heapq
+import math
+
+import numpy as np
+
+from distances import EARTH_RADIUS_KM
+
+
+# KD-tree over centre locations for k-nearest and radius queries.
+#
+# Points are placed on the unit sphere as 3D unit vectors. The straight-line (chord)
+# distance between two unit vectors grows monotonically with their great-circle distance,
+# so an ordinary Euclidean KD-tree answers great-circle queries exactly and each query
+# only visits O(log n) nodes. The tree is stored in flat arrays rather than node objects.
+
+LEAF_SIZE = 8
+
+
+def to_unit_vectors(lat_radians, lon_radians):
+	cos_lat = np.cos(lat_radians)
+	return np.column_stack((cos_lat * np.cos(lon_radians), cos_lat * np.sin(lon_radians), np.sin(lat_radians)))
+
+
+def km_to_chord(km):
+	return 2 * math.sin(min(km / (2 * EARTH_RADIUS_KM), math.pi / 2))
+
+
+def chord_to_km(chord):
+	return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+
+class KDTree:
+
+	def __init__(self, points, leaf_size=LEAF_SIZE):
+		self.points = np.asarray(points, dtype=np.float64)
+		self.order = np.arange(len(self.points))
+		self.leaf_size = leaf_size
+		# node arrays: split dimension (-1 for leaves), split value, children, and the
+		# [start, end) slice of self.order holding the points below the node
+		self.split_dim = []
+		self.split_val = []
+		self.left = []
+		self.right = []
+		self.start = []
+		self.end = []
+		if len(self.points):
+			self._build(0, len(self.points))
+
+	def __len__(self):
+		return len(self.points)
+
+	def _new_node(self, start, end):
+		self.split_dim.append(-1)
+		self.split_val.append(0.0)
+		self.left.append(-1)
+		self.right.append(-1)
+		self.start.append(start)
+		self.end.append(end)
+		return len(self.start) - 1
+
+	def _build(self, start, end):
+		node = self._new_node(start, end)
+		if end - start <= self.leaf_size:
+			return node
+		rows = self.order[start:end]
+		spread = self.points[rows].max(axis=0) - self.points[rows].min(axis=0)
+		dim = int(np.argmax(spread))
+		mid = (end - start) // 2
+		# median split along the widest dimension
+		self.order[start:end] = rows[np.argpartition(self.points[rows, dim], mid)]
+		self.split_dim[node] = dim
+		self.split_val[node] = float(self.points[self.order[start + mid], dim])
+		left = self._build(start, start + mid)
+		right = self._build(start + mid, end)
+		self.left[node] = left
+		self.right[node] = right
+		return node
+
+	def _leaf_distances(self, node, point):
+		rows = self.order[self.start[node]:self.end[node]]
+		return rows, np.sqrt(((self.points[rows] - point) ** 2).sum(axis=1))
+
+	def query(self, point, k):
+		# [(point index, chord distance), ...] for the k nearest points, nearest first
+		if not len(self.points) or k <= 0:
+			return []
+		best = []  # max-heap of (-distance, index)
+		stack = [(0.0, 0)]
+		while stack:
+			bound, node = stack.pop()
+			if len(best) == k and bound >= -best[0][0]:
+				continue
+			dim = self.split_dim[node]
+			if dim < 0:
+				rows, dists = self._leaf_distances(node, point)
+				for row, dist in zip(rows.tolist(), dists.tolist()):
+					if len(best) < k:
+						heapq.heappush(best, (-dist, row))
+					elif dist < -best[0][0]:
+						heapq.heapreplace(best, (-dist, row))
+				continue
+			diff = point[dim] - self.split_val[node]
+			near, far = (self.left[node], self.right[node]) if diff < 0 else (self.right[node], self.left[node])
+			# push the far side first so the near side is searched first
+			stack.append((max(bound, abs(diff)), far))
+			stack.append((bound, near))
+		return sorted(((row, -neg) for neg, row in best), key=lambda item: item[1])
+
+	def query_radius(self, point, radius):
+		# [(point index, chord distance), ...] for every point within the radius, nearest first
+		found = []
+		if not len(self.points):
+			return found
+		stack = [0]
+		while stack:
+			node = stack.pop()
+			dim = self.split_dim[node]
+			if dim < 0:
+				rows, dists = self._leaf_distances(node, point)
+				inside = dists <= radius
+				found.extend(zip(rows[inside].tolist(), dists[inside].tolist()))
+				continue
+			diff = point[dim] - self.split_val[node]
+			if diff - radius < 0:
+				stack.append(self.left[node])
+			if diff + radius >= 0:
+				stack.append(self.right[node])
+		found.sort(key=lambda item: item[1])
+		return found
+
+
+class CentreSpatialIndex:
+
+	# One KD-tree per vaccine type over the centres with known coordinates, so a query
+	# filtered by vaccine type never looks at centres of other types.
+
+	def __init__(self, lat_radians, lon_radians, vaccine_codes, leaf_size=LEAF_SIZE):
+		known = ~(np.isnan(lat_radians) | np.isnan(lon_radians))
+		points = to_unit_vectors(lat_radians, lon_radians)
+		self._trees = {}
+		for code in np.unique(vaccine_codes).tolist():
+			rows = np.flatnonzero(known & (vaccine_codes == code))
+			self._trees[code] = (rows, KDTree(points[rows], leaf_size))
+
+	def _selected(self, vaccine_codes):
+		if vaccine_codes is None:
+			return list(self._trees.values())
+		return [self._trees[code] for code in vaccine_codes if code in self._trees]
+
+	def nearest(self, origin, k, vaccine_codes=None):
+		# [(registry row, km), ...] for the k nearest centres of the given vaccine types
+		point = _origin_vector(origin)
+		candidates = []
+		for rows, tree in self._selected(vaccine_codes):
+			candidates.extend((int(rows[i]), chord) for i, chord in tree.query(point, k))
+		candidates.sort(key=lambda item: item[1])
+		return [(row, chord_to_km(chord)) for row, chord in candidates[:k]]
+
+	def within(self, origin, km, vaccine_codes=None):
+		# [(registry row, km), ...] for every centre within km of the origin, nearest first
+		point = _origin_vector(origin)
+		radius = km_to_chord(km)
+		found = []
+		for rows, tree in self._selected(vaccine_codes):
+			found.extend((int(rows[i]), chord) for i, chord in tree.query_radius(point, radius))
+		found.sort(key=lambda item: item[1])
+		return [(row, chord_to_km(chord)) for row, chord in found]
+
+
+def _origin_vector(origin):
+	lat, lon = np.radians(np.asarray(origin, dtype=np.float64))
+	return to_unit_vectors(np.array([lat]), np.array([lon]))[0]
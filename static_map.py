@@ -0,0 +1,138 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw, ImageFont, features
+
+from mbtiles import MAX_ZOOM, MBTILES_PATH, MIN_ZOOM, TILE_SIZE, MBTiles, tile_xy
+
+
+# Map images drawn on the server from the local MBTiles tiles (see seed_map_cache.py), for
+# clients on slow or metered connections: a few-KB image with the centre, the home marker and
+# the route, instead of the interactive map and everything it loads. The app uses PNG (with a
+# 64 colour palette) because st.image passes PNG through unchanged but re-encodes WebP;
+# WEBP is available for serving the images elsewhere.
+#
+# The zoom is the closest one at which the route, home and centre fit in the image. Images are
+# cached by centre, origin rounded to ORIGIN_DIGITS decimals (about 100 m), distance mode and
+# size, so neighbours of the same centre share one image.
+
+WIDTH = 480
+HEIGHT = 320
+PADDING = 24  # pixels kept free around the route
+ORIGIN_DIGITS = 3
+MAX_IMAGES = 512
+WEBP_QUALITY = 60
+
+MISSING_TILE_COLOUR = (221, 221, 221)
+ROUTE_COLOUR = (51, 136, 255)
+CENTRE_COLOUR = (203, 43, 62)
+HOME_COLOUR = (51, 51, 51)
+ATTRIBUTION = "(c) OpenStreetMap contributors"
+
+
+def _pixel(point, zoom):
+	x, y = tile_xy(float(point[0]), float(point[1]), zoom)
+	return x * TILE_SIZE, y * TILE_SIZE
+
+
+def fit_zoom(points, width, height, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM):
+	# the closest zoom level at which every point fits inside the padded image
+	for zoom in range(max_zoom, min_zoom - 1, -1):
+		pixels = [_pixel(point, zoom) for point in points]
+		xs = [x for x, _ in pixels]
+		ys = [y for _, y in pixels]
+		if max(xs) - min(xs) <= width - 2 * PADDING and max(ys) - min(ys) <= height - 2 * PADDING:
+			return zoom
+	return min_zoom
+
+
+class StaticMapRenderer:
+
+	def __init__(self, tiles, width=WIDTH, height=HEIGHT, image_format="PNG", max_images=MAX_IMAGES):
+		self.tiles = tiles
+		self.width = width
+		self.height = height
+		if image_format == "WEBP" and not features.check("webp"):
+			raise ValueError("this Pillow build cannot write WebP")
+		self.image_format = image_format
+		self.max_images = max_images
+		self.hits = 0
+		self.misses = 0
+		self._images = OrderedDict()
+		self._lock = threading.Lock()
+
+	def _basemap(self, zoom, left, top):
+		image = Image.new("RGB", (self.width, self.height), MISSING_TILE_COLOUR)
+		for tile_x in range(int(left // TILE_SIZE), int((left + self.width) // TILE_SIZE) + 1):
+			for tile_y in range(int(top // TILE_SIZE), int((top + self.height) // TILE_SIZE) + 1):
+				data = self.tiles.get(zoom, tile_x, tile_y)
+				if data is None:
+					continue
+				tile = Image.open(io.BytesIO(data)).convert("RGB")
+				image.paste(tile, (int(round(tile_x * TILE_SIZE - left)), int(round(tile_y * TILE_SIZE - top))))
+		return image
+
+	def draw(self, centre_point, origin, route_points):
+		points = [centre_point, origin] + list(route_points)
+		zoom = fit_zoom(points, self.width, self.height)
+		pixels = [_pixel(point, zoom) for point in points]
+		xs = [x for x, _ in pixels]
+		ys = [y for _, y in pixels]
+		left = (min(xs) + max(xs)) / 2 - self.width / 2
+		top = (min(ys) + max(ys)) / 2 - self.height / 2
+
+		image = self._basemap(zoom, left, top)
+		draw = ImageDraw.Draw(image)
+		on_image = [(x - left, y - top) for x, y in pixels]
+		centre, home, route = on_image[0], on_image[1], on_image[2:]
+		if len(route) > 1:
+			draw.line(route, fill=ROUTE_COLOUR, width=4, joint="curve")
+		for (x, y), colour in ((home, HOME_COLOUR), (centre, CENTRE_COLOUR)):
+			draw.ellipse([x - 8, y - 8, x + 8, y + 8], fill=colour, outline=(255, 255, 255), width=2)
+
+		font = ImageFont.load_default()
+		text_width = draw.textlength(ATTRIBUTION, font=font)
+		draw.rectangle([self.width - text_width - 6, self.height - 14, self.width, self.height], fill=(255, 255, 255))
+		draw.text((self.width - text_width - 3, self.height - 13), ATTRIBUTION, fill=(51, 51, 51), font=font)
+		return image
+
+	def encode(self, image):
+		output = io.BytesIO()
+		if self.image_format == "WEBP":
+			image.save(output, "WEBP", quality=WEBP_QUALITY, method=6)
+		else:
+			# a 64 colour palette keeps map PNGs small without visible banding
+			image.quantize(64).save(output, "PNG", optimize=True)
+		return output.getvalue()
+
+	def render(self, vc, centre_point, origin, route_points, mode="straight line"):
+		key = (vc, round(float(origin[0]), ORIGIN_DIGITS), round(float(origin[1]), ORIGIN_DIGITS), mode,
+			   self.width, self.height)
+		with self._lock:
+			data = self._images.get(key)
+			if data is not None:
+				self._images.move_to_end(key)
+				self.hits += 1
+				return data
+			self.misses += 1
+		data = self.encode(self.draw(centre_point, origin, route_points))
+		with self._lock:
+			self._images[key] = data
+			while len(self._images) > self.max_images:
+				self._images.popitem(last=False)
+		return data
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_static_map_renderer(path=MBTILES_PATH):
+	# shared by every session; None until the tiles have been seeded
+	global _renderer
+	with _renderer_lock:
+		if _renderer is None and os.path.exists(path):
+			_renderer = StaticMapRenderer(MBTiles(path))
+		return _renderer
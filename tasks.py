@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Background pool for upstream I/O, shared by every session of the app.
+#
+# Geocoding and OneMap lookups are submitted here instead of blocking the Streamlit script
+# thread, so independent lookups (the typed address and the selected centre) run at the same
+# time. The pool is bounded: under load requests queue here rather than opening more sockets,
+# and the gateways in upstream.py still decide how fast they reach the upstream services.
+#
+# Tasks that wait on other tasks (HedgedGeocoder fans out to its backends) keep their own
+# executor, so they can never starve the pool they were submitted to.
+
+IO_WORKERS = 16
+
+io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="upstream-io")
+
+
+class TaskSlots:
+
+	# The tasks of one session, one per slot such as "origin" or "centre". Asking a slot for the
+	# same key again returns the existing future, so reruns reuse a lookup that is in flight or
+	# already done. Asking it for a new key supersedes the old task: it is cancelled if it has not
+	# started yet, and a running one is left to finish and fill the shared caches.
+
+	def __init__(self, executor=io_pool):
+		self.executor = executor
+		self._tasks = {}  # slot -> (key, future)
+
+	def submit(self, slot, key, fn, *args):
+		task = self._tasks.get(slot)
+		if task is not None:
+			old_key, future = task
+			# failed lookups are tried again on the next rerun instead of failing forever
+			if old_key == key and not future.cancelled() and not (future.done() and future.exception() is not None):
+				return future
+			future.cancel()
+		future = self.executor.submit(fn, *args)
+		self._tasks[slot] = (key, future)
+		return future
+
@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+import pytest
+
+from centres import CENTRES_PATH, CentreRegistry
+from lite import LITE_PAYLOAD_BUDGET, lite_results, payload_size
+
+
+# The lite page has to stay within LITE_PAYLOAD_BUDGET in the worst case: every vaccine type
+# and region selected, a long typed address, from origins spread over Singapore. The registry
+# holds the real centre names and addresses, since they decide the size, at made-up
+# coordinates on a grid over Singapore.
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDRESS_TEXT = "Block 999A Upper Boon Keng Road #12-345 Singapore 381999 " * 2
+ORIGINS = [[lat, lon] for lat in (1.28, 1.33, 1.38, 1.43) for lon in (103.70, 103.80, 103.90, 103.98)]
+
+
+def centres_frame():
+	return pd.read_csv(os.path.join(REPO_DIR, CENTRES_PATH))
+
+
+def ranked_registry():
+	frame = centres_frame()
+	rows = range(len(frame))
+	frame["Latitude"] = [1.29 + 0.14 * (row % 6) / 5 for row in rows]
+	frame["Longitude"] = [103.70 + 0.28 * (row // 6) / max(1, (len(frame) - 1) // 6) for row in rows]
+	return CentreRegistry(frame)
+
+
+@pytest.mark.parametrize("registry, listed", [
+	(ranked_registry(), "km - [directions]"),
+	(CentreRegistry(centres_frame()), "[directions]"),
+], ids=["with distances", "without distances"])
+def test_lite_results_list_centres_within_budget(registry, listed):
+	for origin in ORIGINS:
+		text = lite_results(registry, origin, ADDRESS_TEXT, registry.vaccine_types, registry.regions)
+		assert listed in text, "the result from %s lists no centre: %s" % (origin, text)
+		assert payload_size(text) <= LITE_PAYLOAD_BUDGET
+
+
+def test_lite_results_without_matching_centre():
+	registry = ranked_registry()
+	assert lite_results(registry, ORIGINS[0], ADDRESS_TEXT, regions=["Nowhere"]) == \
+		"There is no vaccination centre for the selected vaccine types and regions."
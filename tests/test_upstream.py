@@ -0,0 +1,36 @@
+import pytest
+import requests
+
+from upstream import CircuitBreaker, UpstreamBadResponse, UpstreamGateway, UpstreamTimeout, UpstreamUnavailable
+
+
+def down():
+	raise requests.ConnectionError("connection refused")
+
+
+def test_half_open_breaker_recovers_after_a_refused_token():
+	# a half-open breaker whose trial call gets no token before its deadline (as with the
+	# prefetches, which never wait) must let the next call make the trial
+	gateway = UpstreamGateway("Check", rate=2.0, burst=1, max_retries=0,
+							  breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.0))
+	with pytest.raises(UpstreamUnavailable):
+		gateway.call("down", down)
+	with pytest.raises(UpstreamTimeout):
+		gateway.call("no token", lambda: "sent", max_wait=0)
+	assert gateway.call("trial", lambda: "sent") == "sent"
+	assert gateway.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_bad_responses_open_the_breaker():
+	def bad():
+		raise UpstreamBadResponse("Check answered with an error: 404")
+
+	gateway = UpstreamGateway("Check", rate=100.0, burst=5, max_retries=2,
+							  breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60.0))
+	for attempt in range(3):
+		with pytest.raises(UpstreamBadResponse):
+			gateway.call(attempt, bad)
+	assert gateway.stats()["retries"] == 0
+	assert gateway.breaker.state == CircuitBreaker.OPEN
+	with pytest.raises(UpstreamUnavailable):
+		gateway.call("after", lambda: "sent")
@@ -0,0 +1,99 @@
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from map_assets import ASSETS_DIR
+from mbtiles import MBTILES_PATH, MBTiles
+
+
+# Small HTTP server for the offline map mode:
+#     python tile_server.py [singapore.mbtiles] [port]
+#
+#     /static/<path>          vendored JS/CSS/fonts from map_assets/, cached by browsers for a year
+#                             (their paths carry the library version, so they never change)
+#     /tiles/<z>/<x>/<y>.png  tiles from the MBTiles file, cached for a week
+#
+# Then run the app with
+#     MAP_ASSETS_URL=http://localhost:8600/static MAP_TILES_URL=http://localhost:8600/tiles/{z}/{x}/{y}.png
+# and every map load stays on this server. Responses carry an ETag, so a browser revalidating
+# an expired tile gets a 304 instead of the tile again.
+
+PORT = 8600
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+TILE_CACHE_CONTROL = "public, max-age=604800"
+
+TILE_RE = re.compile(r"^/tiles/(\d+)/(\d+)/(\d+)\.(?:png|jpg|jpeg|webp)$")
+
+
+def tile_content_type(data):
+	if data.startswith(b"\x89PNG"):
+		return "image/png"
+	if data.startswith(b"\xff\xd8"):
+		return "image/jpeg"
+	if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+		return "image/webp"
+	return "application/octet-stream"
+
+
+class MapCacheHandler(BaseHTTPRequestHandler):
+
+	tiles = None  # MBTiles, set by serve()
+	static_dir = ASSETS_DIR
+
+	def do_GET(self):
+		path = unquote(urlsplit(self.path).path)
+		match = TILE_RE.match(path)
+		if match:
+			zoom, x, y = (int(value) for value in match.groups())
+			data = self.tiles.get(zoom, x, y)
+			if data is None:
+				self.send_error(404, "tile not in " + self.tiles.path)
+				return
+			self._send(data, tile_content_type(data), TILE_CACHE_CONTROL)
+		elif path.startswith("/static/"):
+			root = os.path.realpath(self.static_dir)
+			file_path = os.path.realpath(os.path.join(root, path[len("/static/"):]))
+			if not file_path.startswith(root + os.sep) or not os.path.isfile(file_path):
+				self.send_error(404)
+				return
+			with open(file_path, "rb") as f:
+				data = f.read()
+			content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+			self._send(data, content_type, STATIC_CACHE_CONTROL)
+		else:
+			self.send_error(404)
+
+	def _send(self, data, content_type, cache_control):
+		etag = '"' + hashlib.blake2b(data, digest_size=8).hexdigest() + '"'
+		if self.headers.get("If-None-Match") == etag:
+			self.send_response(304)
+			self.send_header("ETag", etag)
+			self.send_header("Cache-Control", cache_control)
+			self.end_headers()
+			return
+		self.send_response(200)
+		self.send_header("Content-Type", content_type)
+		self.send_header("Content-Length", str(len(data)))
+		self.send_header("Cache-Control", cache_control)
+		self.send_header("ETag", etag)
+		# the maps run in iframes of the Streamlit page, fonts loaded by their CSS need CORS
+		self.send_header("Access-Control-Allow-Origin", "*")
+		self.end_headers()
+		self.wfile.write(data)
+
+
+def serve(path=MBTILES_PATH, port=PORT):
+	if not os.path.exists(path):
+		sys.exit(path + " does not exist, seed it with: python seed_map_cache.py tiles " + path)
+	MapCacheHandler.tiles = MBTiles(path)
+	server = ThreadingHTTPServer(("", int(port)), MapCacheHandler)
+	print("Serving %s and %s/ on port %d" % (path, ASSETS_DIR, int(port)))
+	server.serve_forever()
+
+
+if __name__ == '__main__':
+	serve(*sys.argv[1:3])
@@ -0,0 +1,496 @@
+import csv
+import io
+import math
+import os
+import sys
+import threading
+import zipfile
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from distances import EARTH_RADIUS_KM
+from spatial_index import KDTree, chord_to_km, km_to_chord, to_unit_vectors
+
+
+# Public-transport travel times from a local GTFS feed.
+#
+# `python transit.py build <gtfs.zip or directory> [transit_network.npz]` groups the trips of
+# the feed into RAPTOR routes (trips that call at the same stop sequence) and stores the
+# timetable as flat arrays: for route r, the departure of trip t at its i-th stop is
+#     departures[route_offset[r] + i * route_trips[r] + t]
+# with trips sorted by departure time, so boarding is a binary search over one slice.
+# Walking transfers between nearby stops are precomputed at build time.
+#
+# Trips only run on the dates their service is active (calendar.txt, with the additions and
+# removals of calendar_dates.txt). Every distinct set of active services, typically weekdays,
+# Saturdays and Sundays / public holidays, gets its own timetable, and each date of the feed
+# is mapped to one; a query uses the timetable of its date. Dates outside the feed's calendar
+# use the timetable most dates of the same weekday have. A feed without either calendar file
+# is taken to run every trip every day. Trips running past midnight (times after 24:00:00)
+# stay on the timetable of the day they started, which queries after midnight do not use.
+#
+# Queries run RAPTOR (Delling et al., round-based public transit routing): each round adds
+# one more vehicle ride, so a handful of rounds give the earliest arrival at every stop, and
+# the door-to-door time to a centre is the best arrival at a stop near it plus the walk. Each
+# round scans every route it touches at once with array operations on the stored timetable.
+
+TRANSIT_NETWORK_PATH = os.environ.get("TRANSIT_NETWORK_PATH", "transit_network.npz")
+
+WALK_METRES_PER_SECOND = 1.3
+MAX_WALK_KM = 0.8  # walking to the first stop and from the last stop
+TRANSFER_KM = 0.3  # walking between stops while changing
+MAX_ROUNDS = 4
+
+
+def _has_gtfs_file(source, name):
+	if zipfile.is_zipfile(source):
+		with zipfile.ZipFile(source) as archive:
+			return name in archive.namelist()
+	return os.path.exists(os.path.join(source, name))
+
+
+def _gtfs_reader(source, name):
+	if zipfile.is_zipfile(source):
+		with zipfile.ZipFile(source) as archive:
+			data = archive.read(name).decode("utf-8-sig")
+		return csv.DictReader(io.StringIO(data))
+	with open(os.path.join(source, name), newline="", encoding="utf-8-sig") as f:
+		return csv.DictReader(io.StringIO(f.read()))
+
+
+def _seconds(text):
+	# GTFS times may run past 24:00:00 for trips after midnight
+	hours, minutes, seconds = text.strip().split(":")
+	return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def _date(text):
+	return datetime.strptime(text.strip(), "%Y%m%d").date()
+
+
+def read_service_dates(source):
+	# {date: frozenset(service ids active that day)} over every date the calendars cover,
+	# None when the feed has neither calendar file
+	active = {}
+	found = False
+	if _has_gtfs_file(source, "calendar.txt"):
+		found = True
+		weekdays = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+		for row in _gtfs_reader(source, "calendar.txt"):
+			day, end = _date(row["start_date"]), _date(row["end_date"])
+			while day <= end:
+				services = active.setdefault(day, set())
+				if row[weekdays[day.weekday()]].strip() == "1":
+					services.add(row["service_id"])
+				day += timedelta(days=1)
+	if _has_gtfs_file(source, "calendar_dates.txt"):
+		found = True
+		for row in _gtfs_reader(source, "calendar_dates.txt"):
+			services = active.setdefault(_date(row["date"]), set())
+			if row["exception_type"].strip() == "1":
+				services.add(row["service_id"])
+			else:
+				services.discard(row["service_id"])
+	if not found:
+		return None
+	return {day: frozenset(services) for day, services in active.items()}
+
+
+def _date_number(day):
+	return day.year * 10000 + day.month * 100 + day.day
+
+
+def build_network(source):
+	stop_ids = []
+	stop_lat = []
+	stop_lon = []
+	for row in _gtfs_reader(source, "stops.txt"):
+		stop_ids.append(row["stop_id"])
+		stop_lat.append(float(row["stop_lat"]))
+		stop_lon.append(float(row["stop_lon"]))
+	stop_index = {stop_id: i for i, stop_id in enumerate(stop_ids)}
+
+	trip_services = {}
+	for row in _gtfs_reader(source, "trips.txt"):
+		trip_services[row["trip_id"]] = row["service_id"]
+
+	calls = {}
+	for row in _gtfs_reader(source, "stop_times.txt"):
+		if row["trip_id"] not in trip_services or row["stop_id"] not in stop_index:
+			continue
+		arrival = row["arrival_time"] or row["departure_time"]
+		departure = row["departure_time"] or row["arrival_time"]
+		if not arrival:
+			continue
+		calls.setdefault(row["trip_id"], []).append(
+			(int(row["stop_sequence"]), stop_index[row["stop_id"]], _seconds(arrival), _seconds(departure)))
+
+	# one timetable per distinct set of active services, and the timetable of every date
+	service_dates = read_service_dates(source)
+	if service_dates is None:
+		service_sets = [frozenset(trip_services.values())]
+		dates = []
+		date_timetables = []
+		weekday_timetables = [0] * 7
+	else:
+		service_sets = []
+		dates = sorted(service_dates)
+		date_timetables = []
+		for day in dates:
+			services = service_dates[day]
+			if not services:
+				date_timetables.append(-1)
+				continue
+			if services not in service_sets:
+				service_sets.append(services)
+			date_timetables.append(service_sets.index(services))
+		weekday_timetables = []
+		for weekday in range(7):
+			counts = Counter(timetable for day, timetable in zip(dates, date_timetables) if day.weekday() == weekday)
+			weekday_timetables.append(counts.most_common(1)[0][0] if counts else -1)
+
+	network = {
+		"stop_ids": np.asarray(stop_ids, dtype=str),
+		"stop_lat": np.asarray(stop_lat, dtype=np.float64),
+		"stop_lon": np.asarray(stop_lon, dtype=np.float64),
+		"timetables": np.asarray(len(service_sets), dtype=np.int32),
+		"dates": np.asarray([_date_number(day) for day in dates], dtype=np.int32),
+		"date_timetables": np.asarray(date_timetables, dtype=np.int32),
+		"weekday_timetables": np.asarray(weekday_timetables, dtype=np.int32),
+	}
+	for i, services in enumerate(service_sets):
+		timetable = _build_timetable([trip_calls for trip, trip_calls in calls.items() if trip_services[trip] in services],
+									 len(stop_ids))
+		for name, array in timetable.items():
+			network[_timetable_key(i, name)] = array
+	network.update(_build_transfers(stop_lat, stop_lon))
+	return network
+
+
+def _timetable_key(timetable, name):
+	return "timetable%d_%s" % (timetable, name)
+
+
+def _build_timetable(trips_calls, stop_count):
+	# trips calling at the same stop sequence form one RAPTOR route
+	patterns = {}
+	for trip_calls in trips_calls:
+		if len(trip_calls) < 2:
+			continue
+		trip_calls = sorted(trip_calls)
+		stops = tuple(call[1] for call in trip_calls)
+		patterns.setdefault(stops, []).append(([call[2] for call in trip_calls], [call[3] for call in trip_calls]))
+
+	# a trip that overtakes another one is moved to a separate route, so within every route
+	# later trips are later at every stop and boarding can binary-search the departures
+	routes = []
+	for stops, trips in patterns.items():
+		trips.sort(key=lambda trip: trip[1][0])
+		split = []
+		for trip in trips:
+			for route_trips in split:
+				last = route_trips[-1]
+				if all(d >= e for d, e in zip(trip[1], last[1])) and all(a >= b for a, b in zip(trip[0], last[0])):
+					route_trips.append(trip)
+					break
+			else:
+				split.append([trip])
+		routes.extend((stops, route_trips) for route_trips in split)
+
+	route_stop_ptr = [0]
+	route_stops = []
+	route_offset = []
+	route_trips = []
+	arrivals = []
+	departures = []
+	for stops, trips in routes:
+		route_stops.extend(stops)
+		route_stop_ptr.append(len(route_stops))
+		route_offset.append(len(departures))
+		route_trips.append(len(trips))
+		for i in range(len(stops)):
+			arrivals.extend(trip[0][i] for trip in trips)
+			departures.extend(trip[1][i] for trip in trips)
+
+	# stop -> (route, position in route) lookups
+	stop_route_lists = [[] for _ in range(stop_count)]
+	for route in range(len(route_offset)):
+		for position in range(route_stop_ptr[route], route_stop_ptr[route + 1]):
+			stop_route_lists[route_stops[position]].append((route, position - route_stop_ptr[route]))
+	stop_route_ptr = [0]
+	stop_routes = []
+	stop_route_positions = []
+	for entries in stop_route_lists:
+		stop_routes.extend(entry[0] for entry in entries)
+		stop_route_positions.extend(entry[1] for entry in entries)
+		stop_route_ptr.append(len(stop_routes))
+
+	return {
+		"route_stop_ptr": np.asarray(route_stop_ptr, dtype=np.int32),
+		"route_stops": np.asarray(route_stops, dtype=np.int32),
+		"route_offset": np.asarray(route_offset, dtype=np.int64),
+		"route_trips": np.asarray(route_trips, dtype=np.int32),
+		"arrivals": np.asarray(arrivals, dtype=np.int32),
+		"departures": np.asarray(departures, dtype=np.int32),
+		"stop_route_ptr": np.asarray(stop_route_ptr, dtype=np.int32),
+		"stop_routes": np.asarray(stop_routes, dtype=np.int32),
+		"stop_route_positions": np.asarray(stop_route_positions, dtype=np.int32),
+	}
+
+
+def _build_transfers(stop_lat, stop_lon):
+	# walking transfers between stops within TRANSFER_KM of each other
+	lat_radians = np.radians(np.asarray(stop_lat, dtype=np.float64))
+	lon_radians = np.radians(np.asarray(stop_lon, dtype=np.float64))
+	vectors = to_unit_vectors(lat_radians, lon_radians)
+	tree = KDTree(vectors)
+	transfer_ptr = [0]
+	transfer_stops = []
+	transfer_seconds = []
+	for stop in range(len(stop_lat)):
+		for other, chord in tree.query_radius(vectors[stop], km_to_chord(TRANSFER_KM)):
+			if other != stop:
+				transfer_stops.append(other)
+				transfer_seconds.append(int(math.ceil(chord_to_km(chord) * 1000 / WALK_METRES_PER_SECOND)))
+		transfer_ptr.append(len(transfer_stops))
+
+	return {
+		"transfer_ptr": np.asarray(transfer_ptr, dtype=np.int32),
+		"transfer_stops": np.asarray(transfer_stops, dtype=np.int32),
+		"transfer_seconds": np.asarray(transfer_seconds, dtype=np.int32),
+	}
+
+
+def save_network(network, path=TRANSIT_NETWORK_PATH):
+	np.savez_compressed(path, **network)
+
+
+class Timetable:
+
+	# the RAPTOR routes of one set of active services, see build_network
+
+	def __init__(self, arrays, timetable):
+		def load(name):
+			return arrays[_timetable_key(timetable, name)]
+		self.route_stop_ptr = load("route_stop_ptr")
+		self.route_stops = load("route_stops")
+		self.route_offset = load("route_offset")
+		self.route_trips = load("route_trips")
+		self.arrivals = load("arrivals")
+		self.departures = load("departures")
+		self.stop_route_ptr = load("stop_route_ptr")
+		self.stop_routes = load("stop_routes")
+		self.stop_route_positions = load("stop_route_positions")
+		self.route_lengths = np.diff(self.route_stop_ptr)
+
+	def __len__(self):
+		return len(self.route_trips)
+
+
+class TransitNetwork:
+
+	def __init__(self, arrays):
+		self.stop_ids = arrays["stop_ids"]
+		self._stop_lat_radians = np.radians(arrays["stop_lat"])
+		self._stop_lon_radians = np.radians(arrays["stop_lon"])
+		self._stop_tree = KDTree(to_unit_vectors(self._stop_lat_radians, self._stop_lon_radians))
+		self.timetables = [Timetable(arrays, i) for i in range(int(arrays["timetables"]))]
+		self._dates = arrays["dates"]
+		self._date_timetables = arrays["date_timetables"]
+		self._weekday_timetables = arrays["weekday_timetables"]
+		self._transfer_ptr = arrays["transfer_ptr"]
+		self._transfer_stops = arrays["transfer_stops"]
+		self._transfer_seconds = arrays["transfer_seconds"]
+
+	@classmethod
+	def load(cls, path=TRANSIT_NETWORK_PATH):
+		with np.load(path) as arrays:
+			return cls({name: arrays[name] for name in arrays.files})
+
+	def __len__(self):
+		return len(self.stop_ids)
+
+	def timetable_for(self, day):
+		# the timetable running on a date, None when nothing runs that day
+		number = _date_number(day)
+		i = int(np.searchsorted(self._dates, number))
+		if i < len(self._dates) and self._dates[i] == number:
+			timetable = int(self._date_timetables[i])
+		else:
+			timetable = int(self._weekday_timetables[day.weekday()])
+		return self.timetables[timetable] if timetable >= 0 else None
+
+	def stops_near(self, point, km=MAX_WALK_KM):
+		# [(stop, walking seconds), ...] for the stops within km of a [lat, lon] point
+		lat, lon = math.radians(float(point[0])), math.radians(float(point[1]))
+		vector = to_unit_vectors(np.array([lat]), np.array([lon]))[0]
+		return [(stop, _walk_seconds(chord_to_km(chord)))
+				for stop, chord in self._stop_tree.query_radius(vector, km_to_chord(km))]
+
+	def earliest_arrivals(self, access, departure_time, day, rounds=MAX_ROUNDS):
+		# earliest arrival time (seconds) at every stop on the given date, given
+		# [(stop, walking seconds)] from the origin
+		return self._arrivals(access, departure_time, day, rounds)[0].tolist()
+
+	def _arrivals(self, access, departure_time, day, rounds=MAX_ROUNDS):
+		# (earliest arrivals, earliest arrivals on foot alone) at every stop; a stop arrived at
+		# earlier than on foot was reached by riding
+		timetable = self.timetable_for(day)
+		best = np.full(len(self.stop_ids), math.inf)
+		for stop, walk in access:
+			best[stop] = min(best[stop], departure_time + walk)
+		previous_round = best.copy()
+		marked = self._walk_transfers(np.flatnonzero(best < math.inf), best, previous_round)
+		walking = best.copy()
+		if timetable is None:
+			return best, walking
+
+		for _ in range(rounds):
+			if not len(marked):
+				break
+			current_round = previous_round.copy()
+			reached = self._scan_routes(timetable, marked, previous_round, current_round, best)
+			marked = self._walk_transfers(reached, best, current_round)
+			previous_round = current_round
+		return best, walking
+
+	def _scan_routes(self, timetable, marked, previous_round, current_round, best):
+		# one RAPTOR round over every route serving a marked stop, from its earliest marked
+		# position on, for all routes at once; returns the stops whose arrival improved
+		entries = _ranges(timetable.stop_route_ptr[marked], timetable.stop_route_ptr[marked + 1] - timetable.stop_route_ptr[marked])
+		routes = timetable.stop_routes[entries]
+		positions = timetable.stop_route_positions[entries]
+		order = np.lexsort((positions, routes))
+		routes, positions = routes[order], positions[order]
+		first = _first_of_runs(routes)
+		routes, positions = routes[first], positions[first]
+		if not len(routes):
+			return routes
+
+		# one row per (route, stop from its first marked position on)
+		lengths = timetable.route_lengths[routes] - positions
+		segment = np.repeat(np.arange(len(routes)), lengths)
+		row_positions = _ranges(positions, lengths)
+		stops = timetable.route_stops[timetable.route_stop_ptr[routes][segment] + row_positions]
+		trips = timetable.route_trips[routes][segment].astype(np.int64)
+		row_start = timetable.route_offset[routes][segment] + row_positions * trips
+
+		# trips are ordered at every stop, so the trip boarded at a stop is the number of trips
+		# leaving before we are ready there (a binary search on every row at once) ...
+		ready = previous_round[stops]
+		low = np.zeros(len(stops), dtype=np.int64)
+		high = trips.copy()
+		searching = np.flatnonzero(low < high)
+		while len(searching):
+			middle = (low[searching] + high[searching]) // 2
+			later = timetable.departures[row_start[searching] + middle] < ready[searching]
+			low[searching] = np.where(later, middle + 1, low[searching])
+			high[searching] = np.where(later, high[searching], middle)
+			searching = searching[low[searching] < high[searching]]
+		# ... and the trip ridden past a stop is the earliest one boarded at a stop before it
+		# on the same route: a running minimum that restarts on every route
+		restart = np.int64(trips.max() + 1) * segment
+		riding = np.minimum.accumulate(low - restart) + restart
+		ridden = np.empty(len(stops), dtype=np.int64)
+		ridden[1:] = riding[:-1]
+		ridden[_first_of_runs(segment)] = -1
+		on_trip = np.flatnonzero((ridden >= 0) & (ridden < trips))
+
+		arrivals = timetable.arrivals[row_start[on_trip] + ridden[on_trip]]
+		stops = stops[on_trip]
+		improved = arrivals < best[stops]
+		stops, arrivals = stops[improved], arrivals[improved]
+		np.minimum.at(best, stops, arrivals)
+		np.minimum.at(current_round, stops, arrivals)
+		return np.unique(stops)
+
+	def _walk_transfers(self, marked, best, current_round):
+		# one walk of at most TRANSFER_KM from every marked stop to the stops near it; returns
+		# the marked stops plus the stops the walks improved
+		counts = self._transfer_ptr[marked + 1] - self._transfer_ptr[marked]
+		entries = _ranges(self._transfer_ptr[marked], counts)
+		others = self._transfer_stops[entries]
+		walked = current_round[np.repeat(marked, counts)] + self._transfer_seconds[entries]
+		improved = walked < best[others]
+		others, walked = others[improved], walked[improved]
+		np.minimum.at(best, others, walked)
+		np.minimum.at(current_round, others, walked)
+		return np.union1d(marked, others)
+
+	def travel_times(self, origin, destinations, departure_time, day):
+		# door-to-door (seconds, by transit) from origin to each [lat, lon] destination leaving
+		# at departure_time on the given date: the public transport time when it is faster than
+		# walking the whole way, otherwise the walking time with by transit False
+		# ((inf, False) if unreachable)
+		access = self.stops_near(origin)
+		best, walking = self._arrivals(access, departure_time, day)
+		ridden = (best < walking).tolist()
+		best = best.tolist()
+		times = []
+		for destination in destinations:
+			if destination is None or any(math.isnan(float(value)) for value in destination):
+				times.append((math.inf, False))
+				continue
+			on_foot = _walk_seconds(_km(origin, destination))
+			by_transit = math.inf
+			for stop, walk in self.stops_near(destination):
+				seconds = best[stop] + walk - departure_time
+				if ridden[stop]:
+					by_transit = min(by_transit, seconds)
+				else:
+					on_foot = min(on_foot, seconds)
+			times.append((by_transit, True) if by_transit < on_foot else (on_foot, False))
+		return times
+
+
+def _ranges(starts, counts):
+	# the concatenation of range(start, start + count) over the pairs
+	counts = np.asarray(counts, dtype=np.int64)
+	ends = np.cumsum(counts)
+	return np.repeat(np.asarray(starts, dtype=np.int64) - (ends - counts), counts) + np.arange(ends[-1] if len(ends) else 0)
+
+
+def _first_of_runs(values):
+	# True where a run of equal values starts
+	first = np.ones(len(values), dtype=bool)
+	first[1:] = values[1:] != values[:-1]
+	return first
+
+
+def _km(a, b):
+	lat1, lon1, lat2, lon2 = (math.radians(float(value)) for value in (a[0], a[1], b[0], b[1]))
+	h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+	return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(h, 1.0)))
+
+
+def _walk_seconds(km):
+	return int(math.ceil(km * 1000 / WALK_METRES_PER_SECOND))
+
+
+_network = None
+_network_loaded = False
+_network_lock = threading.Lock()
+
+
+def get_transit_network(path=TRANSIT_NETWORK_PATH):
+	# loaded once per process; None when no GTFS feed has been built
+	global _network, _network_loaded
+	with _network_lock:
+		if not _network_loaded:
+			if os.path.exists(path):
+				_network = TransitNetwork.load(path)
+			_network_loaded = True
+		return _network
+
+
+if __name__ == '__main__':
+	if len(sys.argv) not in (3, 4) or sys.argv[1] != "build":
+		sys.exit("usage: python transit.py build <gtfs.zip or directory> [transit_network.npz]")
+	network = build_network(sys.argv[2])
+	target = sys.argv[3] if len(sys.argv) == 4 else TRANSIT_NETWORK_PATH
+	save_network(network, target)
+	routes = [len(network[_timetable_key(i, "route_trips")]) for i in range(int(network["timetables"]))]
+	print("Built %d timetables (%s routes) for %d dates over %d stops into %s" % (
+		len(routes), ", ".join(str(count) for count in routes), len(network["dates"]), len(network["stop_ids"]), target))
@@ -0,0 +1,292 @@
+import random
+import threading
+import time
+
+import requests
+from geopy.exc import GeocoderRateLimited, GeocoderTimedOut, GeocoderUnavailable
+
+
+# Process-wide gateway in front of the upstream geocoders.
+#
+# Every session of the app goes through the same gateway per upstream:
+#   - identical lookups that are already in flight are coalesced, the later callers wait for
+#     the first caller's result instead of sending their own request (single flight);
+#   - the remaining requests are spaced out by a token bucket so we stay within the upstream's
+#     usage policy (Nominatim allows at most one request per second);
+#   - callers queue for a token in arrival order, and give up with UpstreamTimeout if their
+#     turn would come after their deadline instead of piling up behind a burst;
+#   - transient failures are retried a bounded number of times with jittered exponential
+#     backoff, as long as the upstream's retry budget allows it;
+#   - a circuit breaker opens after repeated failures, so while an upstream is down calls
+#     fail straight away with UpstreamUnavailable instead of waiting for socket timeouts.
+
+
+class UpstreamError(Exception):
+	pass
+
+
+class UpstreamTimeout(UpstreamError):
+	pass
+
+
+class UpstreamUnavailable(UpstreamError):
+	pass
+
+
+class UpstreamBadResponse(UpstreamError):
+	# the upstream answered, but with an error status or a body we cannot use; counts against
+	# its circuit breaker, unlike a rejected query, but is not retried
+	pass
+
+
+def is_transient_http_error(error):
+	if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+		return True
+	if isinstance(error, requests.HTTPError) and error.response is not None:
+		return error.response.status_code >= 500 or error.response.status_code == 429
+	return False
+
+
+def is_transient_geocoder_error(error):
+	return isinstance(error, (GeocoderTimedOut, GeocoderUnavailable, GeocoderRateLimited)) or is_transient_http_error(error)
+
+
+class TokenBucket:
+
+	def __init__(self, rate, capacity=1):
+		self.rate = float(rate)  # tokens per second
+		self.capacity = float(capacity)
+		self._tokens = float(capacity)
+		self._updated = time.monotonic()
+		self._lock = threading.Lock()
+
+	def reserve(self, deadline=None):
+		# take a token, returning how long to wait before using it, or None if that wait would
+		# pass the deadline (nothing is taken then); waiting callers are served in order because
+		# each reservation pushes the bucket further into debt
+		with self._lock:
+			now = time.monotonic()
+			self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+			self._updated = now
+			wait = max(0.0, (1.0 - self._tokens) / self.rate)
+			if deadline is not None and wait > 0 and now + wait > deadline:
+				return None
+			self._tokens -= 1.0
+			return wait
+
+	def acquire(self, deadline=None):
+		wait = self.reserve(deadline)
+		if wait is None:
+			return False
+		if wait > 0:
+			time.sleep(wait)
+		return True
+
+
+class CircuitBreaker:
+
+	# closed: calls go through; open: calls are refused until reset_timeout has passed;
+	# half-open: one trial call decides whether to close again or stay open
+
+	CLOSED = "closed"
+	OPEN = "open"
+	HALF_OPEN = "half-open"
+
+	def __init__(self, failure_threshold=5, reset_timeout=30.0):
+		self.failure_threshold = failure_threshold
+		self.reset_timeout = reset_timeout
+		self.state = self.CLOSED
+		self._failures = 0
+		self._opened_at = 0.0
+		self._trial_running = False
+		self._trial_thread = None
+		self._lock = threading.Lock()
+
+	def allow(self):
+		with self._lock:
+			if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+				self.state = self.HALF_OPEN
+				self._trial_running = False
+			if self.state == self.CLOSED:
+				return True
+			if self.state == self.HALF_OPEN and not self._trial_running:
+				self._trial_running = True
+				self._trial_thread = threading.get_ident()
+				return True
+			return False
+
+	def release(self):
+		# the calling thread's trial ended without reaching the upstream (e.g. no token before
+		# its deadline), so the next caller makes the trial instead of the breaker staying
+		# half-open with a trial that never finishes
+		with self._lock:
+			if self._trial_running and self._trial_thread == threading.get_ident():
+				self._trial_running = False
+
+	def record_success(self):
+		with self._lock:
+			self.state = self.CLOSED
+			self._failures = 0
+			self._trial_running = False
+
+	def record_failure(self):
+		with self._lock:
+			self._failures += 1
+			if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+				self.state = self.OPEN
+				self._opened_at = time.monotonic()
+				self._trial_running = False
+
+
+class RetryBudget:
+
+	# every request earns `ratio` of a retry, so retries stay a bounded fraction of the traffic
+	# and a failing upstream is not hit with a multiple of its normal load
+
+	def __init__(self, ratio=0.1, min_balance=3.0, max_balance=10.0):
+		self.ratio = ratio
+		self.max_balance = max_balance
+		self._balance = min_balance
+		self._lock = threading.Lock()
+
+	def deposit(self):
+		with self._lock:
+			self._balance = min(self.max_balance, self._balance + self.ratio)
+
+	def withdraw(self):
+		with self._lock:
+			if self._balance < 1.0:
+				return False
+			self._balance -= 1.0
+			return True
+
+
+def backoff_delay(attempt, base=0.25, cap=2.0):
+	# "full jitter": uniformly random up to the exponential backoff for this attempt
+	return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class _Call:
+
+	def __init__(self):
+		self.done = threading.Event()
+		self.result = None
+		self.error = None
+
+
+class SingleFlight:
+
+	def __init__(self):
+		self.coalesced = 0
+		self._calls = {}
+		self._lock = threading.Lock()
+
+	def do(self, key, fn, deadline=None):
+		with self._lock:
+			call = self._calls.get(key)
+			leader = call is None
+			if leader:
+				call = self._calls[key] = _Call()
+			else:
+				self.coalesced += 1
+		if not leader:
+			timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+			if not call.done.wait(timeout):
+				raise UpstreamTimeout("timed out waiting for an identical request in flight")
+			if call.error is not None:
+				raise call.error
+			return call.result
+		try:
+			call.result = fn()
+			return call.result
+		except Exception as e:
+			call.error = e
+			raise
+		finally:
+			with self._lock:
+				del self._calls[key]
+			call.done.set()
+
+
+class UpstreamGateway:
+
+	def __init__(self, name, rate, burst=1, max_wait=10.0, max_retries=2, transient=is_transient_http_error,
+				 breaker=None, budget=None):
+		self.name = name
+		self.max_wait = max_wait
+		self.max_retries = max_retries
+		self.transient = transient
+		self.bucket = TokenBucket(rate, burst)
+		self.flights = SingleFlight()
+		self.breaker = breaker or CircuitBreaker()
+		self.budget = budget or RetryBudget()
+		self.requests = 0
+		self.retries = 0
+		self.rejected = 0
+		self.failures = 0
+		self._lock = threading.Lock()
+
+	def _count(self, counter):
+		with self._lock:
+			setattr(self, counter, getattr(self, counter) + 1)
+
+	def _send(self, fn, deadline):
+		if not self.breaker.allow():
+			self._count("rejected")
+			raise UpstreamUnavailable(self.name + " is unavailable, try again in a moment")
+		try:
+			self.budget.deposit()
+			attempt = 0
+			while True:
+				if not self.bucket.acquire(deadline):
+					self._count("rejected")
+					raise UpstreamTimeout(self.name + " is busy, try again in a moment")
+				self._count("requests")
+				try:
+					result = fn()
+				except Exception as e:
+					if isinstance(e, UpstreamBadResponse):
+						self._count("failures")
+						self.breaker.record_failure()
+						raise
+					if not self.transient(e):
+						# the upstream answered, e.g. a bad query, so it is healthy
+						self.breaker.record_success()
+						raise
+					self._count("failures")
+					self.breaker.record_failure()
+					delay = backoff_delay(attempt)
+					if (attempt >= self.max_retries or time.monotonic() + delay > deadline
+							or not self.breaker.allow() or not self.budget.withdraw()):
+						raise UpstreamUnavailable(self.name + " did not respond: " + str(e)) from e
+					self._count("retries")
+					attempt += 1
+					time.sleep(delay)
+					continue
+				self.breaker.record_success()
+				return result
+		finally:
+			# a no-op once the call has been recorded as a success or failure
+			self.breaker.release()
+
+	def call(self, key, fn, max_wait=None):
+		# run fn() for key through the gateway, sharing the result with concurrent identical calls
+		deadline = time.monotonic() + (self.max_wait if max_wait is None else max_wait)
+		return self.flights.do(key, lambda: self._send(fn, deadline), deadline)
+
+	def stats(self):
+		with self._lock:
+			return {
+				"requests": self.requests,
+				"coalesced": self.flights.coalesced,
+				"retries": self.retries,
+				"failures": self.failures,
+				"rejected": self.rejected,
+				"circuit": self.breaker.state,
+			}
+
+
+# Nominatim's usage policy allows an absolute maximum of one request per second;
+# OneMap allows 250 calls a minute
+nominatim_gateway = UpstreamGateway("Nominatim", rate=1.0, burst=1, max_wait=10.0, transient=is_transient_geocoder_error)
+onemap_gateway = UpstreamGateway("OneMap", rate=4.0, burst=4, max_wait=5.0)